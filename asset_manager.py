@@ -8,8 +8,94 @@ Used for tracking, reproducibility, and cloud deployment
 
 import os
 import json
+import logging
 from datetime import datetime
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from json_utils import dump_json, dump_json_streamed, ensure_parent_dir
+
+logger = logging.getLogger("aibytes")
+
+try:
+    from blake3 import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+# Output formats described in the asset spec when no video_info is given
+DEFAULT_VIDEO_FORMATS = (
+    {
+        'name': 'YouTube Shorts',
+        'resolution': '1080x1920',
+        'aspect_ratio': '9:16',
+        'fps': 30,
+        'codec': 'h264'
+    },
+    {
+        'name': 'YouTube Standard',
+        'resolution': '1920x1080',
+        'aspect_ratio': '16:9',
+        'fps': 30,
+        'codec': 'h264'
+    },
+)
+
+# Read size used when hashing without hashlib.file_digest (Python < 3.11)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_md5(filename):
+    """
+    Stream a file through MD5 without loading it into memory
+    """
+    with open(filename, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        h = hashlib.md5()
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def _file_hashes(filename):
+    """
+    Hash a file for the manifest
+    Returns (blake3_hash, md5_hash); MD5 is only computed when blake3 is not installed
+    """
+    if HAS_BLAKE3:
+        h = blake3(max_threads=blake3.AUTO)
+        h.update_mmap(filename)
+        return h.hexdigest(), None
+    return None, _file_md5(filename)
+
+
+def _file_info(filename):
+    """
+    Stat and hash a file
+    Returns (file_size, blake3_hash, md5_hash), or (0, None, None) if it does not exist
+    """
+    try:
+        file_size = os.stat(filename).st_size
+        blake3_hash, md5_hash = _file_hashes(filename)
+    except FileNotFoundError:
+        return 0, None, None
+    return file_size, blake3_hash, md5_hash
+
+
+def _parallel_map(func, items):
+    """Map func over items on a thread pool sized to the CPU count, keeping order"""
+    if not items:
+        return []
+    workers = min(len(items), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
+
+
+def _dir_entry_info(entry):
+    """Like _file_info() for an os.DirEntry, reusing its cached stat result"""
+    blake3_hash, md5_hash = _file_hashes(entry.path)
+    return entry.stat().st_size, blake3_hash, md5_hash
 
 
 class AssetManager:
@@ -17,18 +103,21 @@ class AssetManager:
     
     def __init__(self, project_name="AI Tech Bytes", date_str=None):
         self.project_name = project_name
-        self.date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+        # One timestamp per run, shared by every asset and workflow step
+        self._run_time = datetime.now()
+        self._run_ts = self._run_time.isoformat()
+        self.date_str = date_str or self._run_time.strftime('%Y-%m-%d')
         self.assets = {}
         self.manifest = {
             'project': project_name,
             'date': self.date_str,
             'version': '2.0',
-            'generated': datetime.now().isoformat(),
+            'generated': self._run_ts,
             'assets': [],
             'workflow_steps': []
         }
     
-    def add_asset(self, asset_type, filename, description, source=None, metadata=None):
+    def add_asset(self, asset_type, filename, description, source=None, metadata=None, file_info=None):
         """
         Add an asset to the manifest
         
@@ -38,14 +127,11 @@ class AssetManager:
             description: Human-readable description
             source: Where the asset came from (API, RSS, etc.)
             metadata: Additional metadata dict
+            file_info: Precomputed (file_size, blake3_hash, md5_hash); stat+hash the file if None
         """
-        if os.path.exists(filename):
-            file_size = os.path.getsize(filename)
-            with open(filename, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
-        else:
-            file_size = 0
-            file_hash = None
+        if file_info is None:
+            file_info = _file_info(filename)
+        file_size, blake3_hash, md5_hash = file_info
         
         asset = {
             'type': asset_type,
@@ -53,16 +139,56 @@ class AssetManager:
             'description': description,
             'source': source,
             'file_size_bytes': file_size,
-            'md5_hash': file_hash,
-            'created': datetime.now().isoformat(),
+            'blake3_hash': blake3_hash,
+            'md5_hash': md5_hash,
+            'created': self._run_ts,
             'metadata': metadata or {}
         }
         
         self.manifest['assets'].append(asset)
-        print("[OK] Added asset: {} ({})".format(filename, asset_type))
+        logger.info("[OK] Added asset: {} ({})".format(filename, asset_type))
         
         return asset
     
+    def add_assets(self, assets):
+        """
+        Add several assets at once, hashing the files in parallel
+        (hashlib and blake3 release the GIL while hashing)
+        
+        Args:
+            assets: List of dicts of add_asset() keyword arguments
+        
+        Returns:
+            List of added asset dicts, in input order
+        """
+        file_infos = _parallel_map(_file_info, [a['filename'] for a in assets])
+        return [self.add_asset(file_info=info, **a) for a, info in zip(assets, file_infos)]
+    
+    def add_assets_from_dir(self, path, asset_type, description_fmt='{name}', source=None):
+        """
+        Add every regular file in a directory as an asset
+        Uses one os.scandir pass (stat results come cached with the entries)
+        and hashes the files in parallel
+        
+        Args:
+            path: Directory to scan (not recursive)
+            asset_type: Asset type for every file
+            description_fmt: Description template, formatted with name=<file name>
+            source: Where the assets came from
+        
+        Returns:
+            List of added asset dicts, sorted by file name
+        """
+        with os.scandir(path) as it:
+            entries = sorted((entry for entry in it if entry.is_file()), key=lambda entry: entry.name)
+        
+        file_infos = _parallel_map(_dir_entry_info, entries)
+        return [
+            self.add_asset(asset_type, entry.path, description_fmt.format(name=entry.name),
+                           source=source, file_info=info)
+            for entry, info in zip(entries, file_infos)
+        ]
+    
     def add_workflow_step(self, step_name, step_type, status, details=None):
         """
         Add a workflow step to the manifest
@@ -77,7 +203,7 @@ class AssetManager:
             'name': step_name,
             'type': step_type,
             'status': status,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self._run_ts,
             'details': details or {}
         }
         
@@ -92,33 +218,37 @@ class AssetManager:
             news_items: List of news article dicts
             script_text: Generated video script
             audio_duration: Duration in seconds
-            video_info: Dict with video properties
+            video_info: Dict with video properties (None for DEFAULT_VIDEO_FORMATS)
         
         Returns:
             Complete asset spec as dict
         """
+        articles = []
+        for i, item in enumerate(news_items):
+            description = item.get('description') or ''
+            articles.append({
+                'order': i + 1,
+                'title': item.get('title') or '',
+                'source': item.get('source') or '',
+                'character_count': len(description)
+            })
+        
+        word_count = len(script_text.split())
+        
         spec = {
             'id': "{}_{}_{}".format(
                 self.project_name.replace(' ', '_').lower(),
                 self.date_str.replace('-', ''),
-                datetime.now().strftime('%H%M%S')
+                self._run_time.strftime('%H%M%S')
             ),
             'date': self.date_str,
             'content': {
                 'news_count': len(news_items),
-                'articles': [
-                    {
-                        'order': i + 1,
-                        'title': item.get('title', ''),
-                        'source': item.get('source', ''),
-                        'character_count': len(item.get('description', ''))
-                    }
-                    for i, item in enumerate(news_items)
-                ],
+                'articles': articles,
                 'script': {
                     'total_characters': len(script_text),
-                    'estimated_words': len(script_text.split()),
-                    'estimated_duration_seconds': len(script_text.split()) / 2.5  # ~2.5 words/sec
+                    'estimated_words': word_count,
+                    'estimated_duration_seconds': word_count / 2.5  # ~2.5 words/sec
                 }
             },
             'audio': {
@@ -129,24 +259,7 @@ class AssetManager:
                 'voice_engine': 'gTTS'
             },
             'video': video_info or {
-                'formats': [
-                    {
-                        'name': 'YouTube Shorts',
-                        'resolution': '1080x1920',
-                        'aspect_ratio': '9:16',
-                        'fps': 30,
-                        'codec': 'h264',
-                        'duration_seconds': audio_duration
-                    },
-                    {
-                        'name': 'YouTube Standard',
-                        'resolution': '1920x1080',
-                        'aspect_ratio': '16:9',
-                        'fps': 30,
-                        'codec': 'h264',
-                        'duration_seconds': audio_duration
-                    }
-                ]
+                'formats': [dict(fmt, duration_seconds=audio_duration) for fmt in DEFAULT_VIDEO_FORMATS]
             },
             'optimization': {
                 'target_duration_seconds': 60,
@@ -165,34 +278,37 @@ class AssetManager:
         
         return spec
     
-    def save_manifest(self, filename=None):
+    def save_manifest(self, filename=None, pretty=False):
         """
         Save the asset manifest to JSON file
+        Assets are streamed one per line rather than encoded as one big tree;
+        pretty=True writes the whole manifest indented instead
         """
         if filename is None:
             filename = "data/asset_manifest_{}.json".format(self.date_str)
         
-        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        ensure_parent_dir(filename)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        if pretty:
+            dump_json(self.manifest, filename, pretty=True)
+        else:
+            dump_json_streamed(self.manifest, 'assets', filename)
         
-        print("[OK] Manifest saved to: {}".format(filename))
+        logger.info("[OK] Manifest saved to: {}".format(filename))
         return filename
     
-    def save_asset_spec(self, spec, filename=None):
+    def save_asset_spec(self, spec, filename=None, pretty=False):
         """
-        Save asset specification to JSON file
+        Save asset specification to JSON file (indented if pretty=True)
         """
         if filename is None:
             filename = "data/asset_spec_{}.json".format(spec.get('id', 'unknown'))
         
-        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        ensure_parent_dir(filename)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(spec, f, indent=2, ensure_ascii=False)
+        dump_json(spec, filename, pretty=pretty)
         
-        print("[OK] Asset spec saved to: {}".format(filename))
+        logger.info("[OK] Asset spec saved to: {}".format(filename))
         return filename
 
 
@@ -212,32 +328,14 @@ def create_complete_asset_manifest(news_items, script_text, audio_duration):
     manager.add_workflow_step('Video Composition', 'compose', 'completed',
         {'formats': 2, 'resolution_1': '1080x1920', 'resolution_2': '1920x1080'})
     
-    # Generate spec
-    video_info = {
-        'formats': [
-            {
-                'name': 'YouTube Shorts',
-                'resolution': '1080x1920',
-                'aspect_ratio': '9:16',
-                'fps': 30,
-                'duration': audio_duration
-            },
-            {
-                'name': 'YouTube Standard',
-                'resolution': '1920x1080',
-                'aspect_ratio': '16:9',
-                'fps': 30,
-                'duration': audio_duration
-            }
-        ]
-    }
-    
-    spec = manager.generate_asset_spec(news_items, script_text, audio_duration, video_info)
+    # Generate spec (video formats come from DEFAULT_VIDEO_FORMATS)
+    spec = manager.generate_asset_spec(news_items, script_text, audio_duration, None)
     
     return manager, spec
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("=== AI Tech Bytes - Asset Manager ===\n")
     
     # Example usage
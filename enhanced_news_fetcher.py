@@ -6,12 +6,20 @@ Fetches AI news from free RSS feeds and public APIs (no premium required)
 """
 
 import os
-import json
-import requests
+import logging
+import operator
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dotenv import load_dotenv
 
-load_dotenv()
+from json_utils import dump_json, ensure_parent_dir, loads_json
+
+logger = logging.getLogger("aibytes")
+
+# requests and python-dotenv are imported on first use so that importing this
+# module (e.g. from main.py with --skip-news) stays cheap
 
 # Free RSS feeds for AI/Tech news (no API key required)
 FREE_RSS_FEEDS = {
@@ -21,32 +29,89 @@ FREE_RSS_FEEDS = {
     'reddit_ai': 'https://www.reddit.com/r/artificial/.rss',
 }
 
-NEWS_API_KEY = os.getenv('NEWS_API_KEY', '')
+NEWS_API_KEY = None  # Resolved from .env / environment by get_news_api_key()
 NEWS_API_URL = 'https://newsapi.org/v2/everything'
 
+# Shared HTTP session: keeps TCP/TLS connections alive across the feeds and NewsAPI
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_news_api_key():
+    """Load .env on first call and return the NewsAPI key ('' if unset)"""
+    global NEWS_API_KEY
+    if NEWS_API_KEY is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+        NEWS_API_KEY = os.getenv('NEWS_API_KEY', '')
+    return NEWS_API_KEY
+
+
+def _get_session():
+    """Create the shared requests.Session on first use (thread-safe)"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'ai-tech-bytes/2.0 (+https://github.com/afasim/ai-tech-bytes)',
+                'Accept-Encoding': 'gzip, deflate',
+            })
+            adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _SESSION = session
+    return _SESSION
+
+# Cap on bytes requested per RSS feed (plenty for the 5 entries we read)
+RSS_MAX_BYTES = 128 * 1024
+
+DEFAULT_SEARCH_TERMS = ('AI', 'machine learning', 'artificial intelligence')
+
+
+def _compile_search_terms(search_terms):
+    """Build one case-insensitive, whole-word regex matching any of the terms"""
+    alternatives = '|'.join(re.escape(term) for term in search_terms)
+    return re.compile(r'\b(?:{})\b'.format(alternatives), re.IGNORECASE)
+
+
+_SEARCH_RE = _compile_search_terms(DEFAULT_SEARCH_TERMS)
+
 
-def parse_rss_feed(feed_url, search_terms=['AI', 'machine learning', 'artificial intelligence']):
+def parse_rss_feed(feed_url, search_terms=None):
     """
     Parse RSS feed and extract AI-related articles
+    search_terms: terms to filter on (defaults to DEFAULT_SEARCH_TERMS)
     Returns list of (title, description, source) tuples
     """
+    search_re = _SEARCH_RE if search_terms is None else _compile_search_terms(search_terms)
+    
     try:
         import feedparser
     except ImportError:
-        print("[WARNING] feedparser not installed. Skipping RSS feeds. Install with: pip install feedparser")
+        logger.warning("[WARNING] feedparser not installed. Skipping RSS feeds. Install with: pip install feedparser")
         return []
     
     try:
-        feed = feedparser.parse(feed_url)
+        # A byte range of a gzip stream can't be decoded, so ask for the raw feed
+        headers = {'Range': 'bytes=0-{}'.format(RSS_MAX_BYTES - 1),
+                   'Accept-Encoding': 'identity'}
+        response = _get_session().get(feed_url, headers=headers, timeout=10)
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
+        if feed.bozo:
+            # Usually the feed was cut off at RSS_MAX_BYTES; entries before the cut still parse
+            logger.warning("[WARNING] RSS feed {} is malformed or truncated: {}".format(
+                feed_url, feed.get('bozo_exception')))
         articles = []
         
         for entry in feed.entries[:5]:  # Get top 5 from each feed
-            title = entry.get('title', '')
-            description = entry.get('summary', '') or entry.get('description', '')
+            title = entry.get('title') or ''
+            description = entry.get('summary') or entry.get('description') or ''
             
             # Filter for AI-related content
-            content_lower = (title + ' ' + description).lower()
-            if any(term.lower() in content_lower for term in search_terms):
+            if search_re.search(title) or search_re.search(description):
                 articles.append({
                     'title': title,
                     'description': description[:200],  # Limit description length
@@ -57,7 +122,7 @@ def parse_rss_feed(feed_url, search_terms=['AI', 'machine learning', 'artificial
         
         return articles
     except Exception as e:
-        print("[WARNING] Error parsing RSS feed {}: {}".format(feed_url, e))
+        logger.warning("[WARNING] Error parsing RSS feed {}: {}".format(feed_url, e))
         return []
 
 
@@ -66,13 +131,16 @@ def fetch_from_free_rss():
     Fetch AI news from free RSS feeds
     Returns list of article dicts
     """
-    print("[INFO] Fetching from free RSS feeds...")
+    logger.info("[INFO] Fetching from free RSS feeds...")
     all_articles = []
     
-    for source_name, feed_url in FREE_RSS_FEEDS.items():
-        print("[INFO] Parsing {}...".format(source_name))
-        articles = parse_rss_feed(feed_url)
-        all_articles.extend(articles)
+    for source_name in FREE_RSS_FEEDS:
+        logger.info("[INFO] Parsing {}...".format(source_name))
+    
+    # Feeds are network-bound, so fetch them concurrently (results keep feed order)
+    with ThreadPoolExecutor(max_workers=len(FREE_RSS_FEEDS)) as executor:
+        for articles in executor.map(parse_rss_feed, FREE_RSS_FEEDS.values()):
+            all_articles.extend(articles)
     
     return all_articles
 
@@ -82,38 +150,39 @@ def fetch_from_newsapi(num_articles=3):
     Fetch from NewsAPI (if key available)
     Returns list of article dicts
     """
-    if not NEWS_API_KEY:
-        print("[WARNING] NEWS_API_KEY not set. Skipping NewsAPI.")
+    api_key = get_news_api_key()
+    if not api_key:
+        logger.warning("[WARNING] NEWS_API_KEY not set. Skipping NewsAPI.")
         return []
     
-    print("[INFO] Fetching from NewsAPI...")
+    logger.info("[INFO] Fetching from NewsAPI...")
     try:
         params = {
             'q': 'artificial intelligence OR machine learning OR AI OR ChatGPT OR neural network',
             'sortBy': 'publishedAt',
             'language': 'en',
             'pageSize': num_articles,
-            'apiKey': NEWS_API_KEY
+            'apiKey': api_key
         }
         
-        response = requests.get(NEWS_API_URL, params=params, timeout=10)
+        response = _get_session().get(NEWS_API_URL, params=params, timeout=10)
         response.raise_for_status()
         
-        data = response.json()
+        data = loads_json(response.content)
         articles = []
         
         for article in data.get('articles', []):
             articles.append({
-                'title': article.get('title', ''),
-                'description': article.get('description', '')[:200],
-                'source': article.get('source', {}).get('name', 'NewsAPI'),
+                'title': article.get('title') or '',
+                'description': (article.get('description') or '')[:200],
+                'source': (article.get('source') or {}).get('name', 'NewsAPI'),
                 'link': article.get('url', ''),
                 'published': article.get('publishedAt', datetime.now().isoformat())
             })
         
         return articles
     except Exception as e:
-        print("[WARNING] Error fetching from NewsAPI: {}".format(e))
+        logger.warning("[WARNING] Error fetching from NewsAPI: {}".format(e))
         return []
 
 
@@ -121,6 +190,11 @@ def fetch_ai_news(num_articles=5, use_rss=True, use_api=True):
     """
     Fetch AI news from multiple free sources
     
+    NewsAPI is queried first; RSS feeds (fetched concurrently with each other,
+    see fetch_from_free_rss()) are only fetched when it doesn't return enough
+    articles on its own. Without a NewsAPI key that check is immediate, so the
+    feeds start right away
+    
     Args:
         num_articles: Number of articles to fetch
         use_rss: Whether to fetch from RSS feeds
@@ -131,100 +205,102 @@ def fetch_ai_news(num_articles=5, use_rss=True, use_api=True):
     """
     all_articles = []
     
-    if use_rss:
-        rss_articles = fetch_from_free_rss()
-        all_articles.extend(rss_articles)
-    
     if use_api:
-        api_articles = fetch_from_newsapi(num_articles)
+        # Over-fetch so duplicate titles don't leave us short
+        api_articles = fetch_from_newsapi(num_articles * 2)
         all_articles.extend(api_articles)
     
+    if use_rss and len(all_articles) < num_articles:
+        rss_articles = fetch_from_free_rss()
+        all_articles.extend(rss_articles)
+    
     if not all_articles:
-        print("[WARNING] No articles fetched. Using sample data.")
+        logger.warning("[WARNING] No articles fetched. Using sample data.")
         return get_sample_news()
     
-    # Deduplicate by title
-    seen_titles = set()
-    unique_articles = []
+    # Deduplicate by title (first occurrence wins, insertion order is kept)
+    articles_by_title = {}
     for article in all_articles:
-        title = article['title']
-        if title not in seen_titles:
-            seen_titles.add(title)
-            unique_articles.append(article)
+        articles_by_title.setdefault(article['title'], article)
+    unique_articles = list(articles_by_title.values())
     
     # Sort by date (newest first) and return top N
     try:
-        unique_articles.sort(
-            key=lambda x: x.get('published', ''),
-            reverse=True
-        )
+        unique_articles.sort(key=operator.itemgetter('published'), reverse=True)
     except:
         pass  # If sorting fails, keep original order
     
     return unique_articles[:num_articles]
 
 
+# Fallback sample news, built once at import (timestamped at import time)
+_SAMPLE_NEWS_TS = datetime.now().isoformat()
+_SAMPLE_NEWS = (
+    {
+        "title": "OpenAI Announces GPT-4 Turbo with 128K Context Window",
+        "description": "OpenAI releases GPT-4 Turbo, doubling the context window to 128K tokens and reducing API costs.",
+        "source": "Sample",
+        "link": "",
+        "published": _SAMPLE_NEWS_TS
+    },
+    {
+        "title": "Google DeepMind Releases AlphaFold3 for Protein Prediction",
+        "description": "DeepMind releases AlphaFold3, predicting not just protein structures but also molecular interactions.",
+        "source": "Sample",
+        "link": "",
+        "published": _SAMPLE_NEWS_TS
+    },
+    {
+        "title": "Meta Open-Sources Llama 2 AI Model",
+        "description": "Meta releases Llama 2, an open-source large language model, for research and commercial use.",
+        "source": "Sample",
+        "link": "",
+        "published": _SAMPLE_NEWS_TS
+    },
+    {
+        "title": "Anthropic Raises $5B for Constitutional AI Research",
+        "description": "Anthropic secures $5 billion in funding to advance safe and beneficial AI research.",
+        "source": "Sample",
+        "link": "",
+        "published": _SAMPLE_NEWS_TS
+    },
+    {
+        "title": "Microsoft Integrates GPT-4 into Windows 11 Copilot",
+        "description": "Microsoft brings advanced AI capabilities to Windows 11 with GPT-4 integration.",
+        "source": "Sample",
+        "link": "",
+        "published": _SAMPLE_NEWS_TS
+    },
+)
+
+
 def get_sample_news():
     """Fallback sample news for testing"""
-    return [
-        {
-            "title": "OpenAI Announces GPT-4 Turbo with 128K Context Window",
-            "description": "OpenAI releases GPT-4 Turbo, doubling the context window to 128K tokens and reducing API costs.",
-            "source": "Sample",
-            "link": "",
-            "published": datetime.now().isoformat()
-        },
-        {
-            "title": "Google DeepMind Releases AlphaFold3 for Protein Prediction",
-            "description": "DeepMind releases AlphaFold3, predicting not just protein structures but also molecular interactions.",
-            "source": "Sample",
-            "link": "",
-            "published": datetime.now().isoformat()
-        },
-        {
-            "title": "Meta Open-Sources Llama 2 AI Model",
-            "description": "Meta releases Llama 2, an open-source large language model, for research and commercial use.",
-            "source": "Sample",
-            "link": "",
-            "published": datetime.now().isoformat()
-        },
-        {
-            "title": "Anthropic Raises $5B for Constitutional AI Research",
-            "description": "Anthropic secures $5 billion in funding to advance safe and beneficial AI research.",
-            "source": "Sample",
-            "link": "",
-            "published": datetime.now().isoformat()
-        },
-        {
-            "title": "Microsoft Integrates GPT-4 into Windows 11 Copilot",
-            "description": "Microsoft brings advanced AI capabilities to Windows 11 with GPT-4 integration.",
-            "source": "Sample",
-            "link": "",
-            "published": datetime.now().isoformat()
-        }
-    ]
+    return [dict(article) for article in _SAMPLE_NEWS]
 
 
-def save_news_to_file(news_items, filename='data/today_news.json'):
+def save_news_to_file(news_items, filename='data/today_news.json', pretty=False):
     """
-    Save news items to JSON file
+    Save news items to JSON file (indented if pretty=True)
     """
-    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    ensure_parent_dir(filename)
     
+    now = time.time()
     news_data = {
-        'date': datetime.now().isoformat(),
+        'date': datetime.fromtimestamp(now).isoformat(),
+        'timestamp': now,  # Same moment as 'date', as a Unix timestamp
         'num_articles': len(news_items),
         'articles': news_items
     }
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(news_data, f, indent=2, ensure_ascii=False)
+    dump_json(news_data, filename, pretty=pretty)
     
-    print("[OK] Saved {} articles to {}".format(len(news_items), filename))
+    logger.info("[OK] Saved {} articles to {}".format(len(news_items), filename))
     return filename
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("=== AI Tech Bytes - Enhanced News Fetcher ===\n")
     
     news = fetch_ai_news(num_articles=5)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON Utilities
+Shared JSON read/write helpers for the pipeline
+Uses orjson (Rust encoder) when installed, falls back to stdlib json
+"""
+
+import json
+import os
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Directories already created by ensure_parent_dir() in this process
+_ENSURED_DIRS = set()
+
+
+def ensure_parent_dir(filename):
+    """
+    Create the parent directory of filename if needed
+    Remembers directories it has created so repeated saves skip the mkdir syscall
+    """
+    directory = os.path.dirname(filename) or '.'
+    if directory not in _ENSURED_DIRS:
+        os.makedirs(directory, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+    return directory
+
+
+def loads_json(data):
+    """
+    Parse JSON from bytes or str (e.g. an HTTP response body)
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_bytes(filename, data):
+    """
+    Write data to filename with os.write, bypassing Python's buffered file layer
+    (normally a single syscall; loops only on a partial write)
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(filename, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+    return filename
+
+
+def load_json(filename):
+    """
+    Read and parse a UTF-8 JSON file
+    Raises json.JSONDecodeError on invalid JSON (orjson's error subclasses it)
+    """
+    with open(filename, 'rb') as f:
+        return loads_json(f.read())
+
+
+def _json_default(obj):
+    """Convert numpy scalars/arrays for stdlib json (orjson handles them natively)"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+
+def _dumps(obj, pretty=False):
+    """Encode obj as UTF-8 JSON bytes (compact unless pretty)"""
+    if HAS_ORJSON:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=options)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                      default=_json_default).encode('utf-8')
+
+
+def dump_json(obj, filename, pretty=False):
+    """
+    Write obj to filename as UTF-8 JSON
+    Output is compact unless pretty=True (2-space indent, for human reading)
+    Returns the filename
+    """
+    return write_bytes(filename, _dumps(obj, pretty))
+
+
+def dump_json_streamed(obj, list_key, filename):
+    """
+    Write dict obj to filename, encoding obj[list_key] one element at a time
+    Each element goes on its own line, so the output is still a single JSON document
+    but the full encoded tree is never held in memory at once
+    Returns the filename
+    """
+    header = {key: value for key, value in obj.items() if key != list_key}
+    
+    with open(filename, 'wb') as f:
+        f.write(_dumps(header)[:-1])  # Leave the object open
+        if header:
+            f.write(b',')
+        f.write(b'\n' + _dumps(list_key) + b':[')
+        for i, item in enumerate(obj[list_key]):
+            f.write(b'\n' if i == 0 else b',\n')
+            f.write(_dumps(item))
+        f.write(b'\n]}\n')
+    
+    return filename
@@ -8,207 +8,356 @@ Automated pipeline: Fetch AI news -> Summarize -> Generate TTS -> Create Video -
 import os
 import sys
 import argparse
-from datetime import datetime
-import json
+import importlib
+import logging
+import logging.handlers
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from json_utils import ensure_parent_dir, load_json, write_bytes
 
 # Fix Unicode issues on Windows
+# Block-buffered so each log line doesn't flush; run_pipeline() flushes at the end
 if sys.platform == 'win32':
     import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8',
+                                  line_buffering=False, write_through=False)
 
-# Import modules
-from news_fetcher import fetch_ai_news, save_news_to_file
-try:
-    from enhanced_news_fetcher import fetch_ai_news as fetch_ai_news_enhanced
-except ImportError:
-    fetch_ai_news_enhanced = None
+# Pipeline modules are imported inside the steps that need them, so skipped
+# steps (--skip-news / --skip-audio / --skip-video) don't pay their import cost
+# (requests, transformers/torch, gTTS, MoviePy, librosa)
+def optional_import(module_name, attr_name):
+    """
+    Import and return module_name.attr_name, or None if the module is unavailable
+    """
+    try:
+        return getattr(importlib.import_module(module_name), attr_name)
+    except ImportError:
+        return None
 
-try:
-    from text_summarizer import create_video_script
-except ImportError:
-    create_video_script = None
+logger = logging.getLogger("aibytes")
+
+# Non-interactive runs (stdout not a terminal, e.g. cron or CI) log to this file,
+# buffered LOG_BUFFER_RECORDS records at a time rather than written line by line
+LOG_FILE = os.getenv('AIBYTES_LOG_FILE', 'data/pipeline.log')
+LOG_BUFFER_RECORDS = 1024
+
+def setup_logging(level=logging.INFO):
+    """
+    Send pipeline status messages (the "aibytes" logger, shared by every module)
+    to stdout when run interactively, otherwise to a buffered LOG_FILE that is
+    flushed when full, on an error, and at exit
+    No-op if the logger already has handlers
+    """
+    if logger.handlers:
+        return
+    if sys.stdout.isatty():
+        handler = logging.StreamHandler(sys.stdout)
+    else:
+        ensure_parent_dir(LOG_FILE)
+        print("[INFO] Logging to {}".format(LOG_FILE))
+        target = logging.FileHandler(LOG_FILE, encoding='utf-8')
+        handler = logging.handlers.MemoryHandler(LOG_BUFFER_RECORDS, flushLevel=logging.ERROR,
+                                                 target=target)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
 
-from tts_generator import generate_audio_from_news
-from video_maker import create_multiple_formats
+def flush_logging():
+    """Write out any buffered log records"""
+    for handler in logger.handlers:
+        handler.flush()
 
-try:
-    from asset_manager import AssetManager, create_complete_asset_manifest
-except ImportError:
-    AssetManager = None
+NEWS_FILE = 'data/today_news.json'
+AUDIO_FILE = 'data/ai_news_audio.mp3'
+
+# Summarized video script (text_summarizer.save_script()'s default path; the TTS
+# step writes its own, unsummarized script next to AUDIO_FILE), and the summarizer
+# settings it was generated with, so changing them regenerates it
+SCRIPT_FILE = 'data/video_script.txt'
+SCRIPT_SETTINGS_FILE = 'data/video_script_settings.txt'
+SCRIPT_MAX_CHARS = 900
+
+def is_up_to_date(output_file, input_file):
+    """
+    Make-style freshness check: True if output_file exists and is
+    at least as new as input_file
+    """
+    try:
+        return os.stat(output_file).st_mtime >= os.stat(input_file).st_mtime
+    except FileNotFoundError:
+        return False
+
+def script_settings():
+    """
+    The settings the summarized script depends on besides the news:
+    the summarizer model and the script's character budget
+    """
+    return "{}|{}".format(optional_import('text_summarizer', 'SUMMARIZER_MODEL'), SCRIPT_MAX_CHARS)
+
+def is_script_up_to_date():
+    """
+    True if SCRIPT_FILE is at least as new as the news and was generated
+    with the current script_settings()
+    """
+    if not is_up_to_date(SCRIPT_FILE, NEWS_FILE):
+        return False
+    try:
+        with open(SCRIPT_SETTINGS_FILE, 'r', encoding='utf-8') as f:
+            return f.read() == script_settings()
+    except OSError:
+        return False
+
+def prepare_directories():
+    """Create the data/ and output/ directories used by later steps"""
+    os.makedirs('data', exist_ok=True)
+    os.makedirs('output', exist_ok=True)
+
+def preload_summarizer():
+    """Load the summarization model so Step 1.5 doesn't wait for it"""
+    preload_model = optional_import('text_summarizer', 'preload_model')
+    if preload_model:
+        preload_model()
 
 def print_banner():
     """Print application banner"""
-    print("="*70)
-    print("  AI Tech Bytes")
-    print("="*70)
-    print("           BYTES - Automated Video Creator")
-    print("="*70)
-    print()
+    logger.info("=" * 70)
+    logger.info("  AI Tech Bytes")
+    logger.info("=" * 70)
+    logger.info("           BYTES - Automated Video Creator")
+    logger.info("=" * 70)
+    logger.info("")
 
-def run_pipeline(skip_news=False, skip_audio=False, skip_video=False, use_enhanced=True, use_summarization=True):
+def run_pipeline(skip_news=False, skip_audio=False, skip_video=False, use_enhanced=True, use_summarization=True,
+                 video_quality='draft', video_codec='libx264'):
     """
     Run the complete pipeline
     """
+    setup_logging()
     print_banner()
     
-    print("[{}] Starting pipeline...\n".format(datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    # Wall-clock start, read once; the finish time is derived from it plus the elapsed time
+    start_time = time.time()
+    logger.info("[{}] Starting pipeline...\n".format(
+        time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))))
+    pipeline_start = step_start = time.monotonic()
     
     # Initialize asset manager
     asset_manager = None
+    AssetManager = optional_import('asset_manager', 'AssetManager')
     if AssetManager:
         asset_manager = AssetManager()
     
     news_items = []
     
+    # Directory prep overlaps the (network-bound) news fetch
+    background = ThreadPoolExecutor(max_workers=2)
+    prepare_future = background.submit(prepare_directories)
+    
     # Step 1: Fetch AI News
     if not skip_news:
-        print("\n" + "="*70)
-        print("STEP 1: Fetching AI News")
-        print("="*70)
+        logger.info("\n" + "=" * 70)
+        logger.info("STEP 1: Fetching AI News")
+        logger.info("=" * 70)
         try:
-            if use_enhanced and fetch_ai_news_enhanced:
-                print("[INFO] Using enhanced news fetcher (RSS + NewsAPI)")
+            from news_fetcher import fetch_ai_news, save_news_to_file
+            fetch_ai_news_enhanced = None
+            if use_enhanced:
+                fetch_ai_news_enhanced = optional_import('enhanced_news_fetcher', 'fetch_ai_news')
+            if fetch_ai_news_enhanced:
+                logger.info("[INFO] Using enhanced news fetcher (RSS + NewsAPI)")
                 news_items = fetch_ai_news_enhanced(num_articles=3, use_rss=True, use_api=True)
             else:
-                print("[INFO] Using standard NewsAPI fetcher")
+                logger.info("[INFO] Using standard NewsAPI fetcher")
                 news_items = fetch_ai_news(num_articles=3)
             
             if news_items:
                 news_file = save_news_to_file(news_items)
-                print("[OK] News fetched and saved: {}".format(news_file))
+                logger.info("[OK] News fetched and saved: {}".format(news_file))
                 if asset_manager:
                     asset_manager.add_asset('news', news_file, 'Fetched AI news articles', 
                         source='Enhanced RSS+API' if use_enhanced else 'NewsAPI')
             else:
-                print("[WARNING] No news items fetched. Using fallback.")
+                logger.warning("[WARNING] No news items fetched. Using fallback.")
         except Exception as e:
-            print("[ERROR] Error fetching news: {}".format(e))
-            import traceback
-            traceback.print_exc()
+            logger.exception("[ERROR] Error fetching news: {}".format(e))
             return False
     else:
-        print("\n[SKIP] Skipping news fetch (using existing data)")
+        logger.info("\n[SKIP] Skipping news fetch (using existing data)")
         # Load existing news
-        if os.path.exists('data/today_news.json'):
-            with open('data/today_news.json', 'r', encoding='utf-8') as f:
-                news_items = json.load(f)
-                print("[OK] Loaded existing news: {} articles".format(len(news_items)))
+        if os.path.exists(NEWS_FILE):
+            news_items = load_json(NEWS_FILE).get('articles', [])
+            logger.info("[OK] Loaded existing news: {} articles".format(len(news_items)))
 
+    step_elapsed = time.monotonic() - step_start
+    logger.info("[INFO] News Fetching took {:.2f}s".format(step_elapsed))
     if asset_manager:
         asset_manager.add_workflow_step('News Fetching', 'fetch', 'completed',
-            {'articles_count': len(news_items), 'use_enhanced': use_enhanced})
+            {'articles_count': len(news_items), 'use_enhanced': use_enhanced,
+             'duration_seconds': round(step_elapsed, 2)})
+    step_start = time.monotonic()
+    
+    try:
+        prepare_future.result()
+    except OSError as e:
+        logger.error("[ERROR] Could not create data/output directories: {}".format(e))
+        background.shutdown()
+        return False
     
     # Step 1.5: Summarize and Generate Script
     script = None
-    if use_summarization and create_video_script and not skip_audio:
-        print("\n" + "="*70)
-        print("STEP 1.5: Summarizing and Generating Video Script")
-        print("="*70)
+    create_video_script = None
+    script_needs_model = None
+    if use_summarization and not skip_audio:
+        create_video_script = optional_import('text_summarizer', 'create_video_script')
+        save_script = optional_import('text_summarizer', 'save_script')
+        script_needs_model = optional_import('text_summarizer', 'script_needs_model')
+    
+    # Load the summarization model in the background only if some article will
+    # actually go through it (not when every article is short or already cached)
+    preload_future = None
+    if (create_video_script and script_needs_model and not is_script_up_to_date()
+            and script_needs_model(news_items, max_total_chars=SCRIPT_MAX_CHARS)):
+        preload_future = background.submit(preload_summarizer)
+    background.shutdown(wait=False)
+    
+    if create_video_script:
+        logger.info("\n" + "=" * 70)
+        logger.info("STEP 1.5: Summarizing and Generating Video Script")
+        logger.info("=" * 70)
         try:
-            print("[INFO] Generating script optimized for 60-second video (~900 chars)")
-            script = create_video_script(news_items, max_total_chars=900)
-            script_file = 'data/ai_news_audio_script.txt'
-            with open(script_file, 'w', encoding='utf-8') as f:
-                f.write(script)
-            print("[OK] Script generated: {} characters".format(len(script)))
-            print("[OK] Saved to: {}".format(script_file))
+            if preload_future is not None and preload_future.exception() is not None:
+                logger.warning("[WARNING] Summarization model failed to load: {}".format(preload_future.exception()))
+            script_file = SCRIPT_FILE
+            if is_script_up_to_date():
+                logger.info("[SKIP] News and summarizer settings unchanged since last script, reusing: {}".format(script_file))
+                with open(script_file, 'r', encoding='utf-8') as f:
+                    script = f.read()
+            else:
+                logger.info("[INFO] Generating script optimized for 60-second video (~{} chars)".format(SCRIPT_MAX_CHARS))
+                script = create_video_script(news_items, max_total_chars=SCRIPT_MAX_CHARS)
+                save_script(script, script_file)
+                write_bytes(SCRIPT_SETTINGS_FILE, script_settings().encode('utf-8'))
+                logger.info("[OK] Script generated: {} characters".format(len(script)))
             if asset_manager:
                 asset_manager.add_asset('script', script_file, 'Generated video script',
                     source='HuggingFace BART summarization', 
                     metadata={'character_count': len(script), 'articles': len(news_items)})
         except Exception as e:
-            print("[WARNING] Summarization failed, using standard script: {}".format(e))
+            logger.warning("[WARNING] Summarization failed, using standard script: {}".format(e))
             script = None
 
+    step_elapsed = time.monotonic() - step_start
+    logger.info("[INFO] Text Summarization took {:.2f}s".format(step_elapsed))
     if asset_manager:
         asset_manager.add_workflow_step('Text Summarization', 'summarize', 'completed',
-            {'engine': 'HuggingFace BART' if use_summarization else 'basic', 'target_chars': 900})
+            {'engine': 'HuggingFace BART' if use_summarization else 'basic', 'target_chars': SCRIPT_MAX_CHARS,
+             'duration_seconds': round(step_elapsed, 2)})
+    step_start = time.monotonic()
     
     # Step 2: Generate TTS Audio
     if not skip_audio:
-        print("\n" + "="*70)
-        print("STEP 2: Generating Text-to-Speech Audio")
-        print("="*70)
+        logger.info("\n" + "=" * 70)
+        logger.info("STEP 2: Generating Text-to-Speech Audio")
+        logger.info("=" * 70)
         try:
-            audio_file = generate_audio_from_news()
+            if is_up_to_date(AUDIO_FILE, NEWS_FILE):
+                logger.info("[SKIP] News unchanged since last audio, reusing: {}".format(AUDIO_FILE))
+                audio_file = AUDIO_FILE
+            else:
+                from tts_generator import generate_audio_from_news
+                audio_file = generate_audio_from_news(news_file=NEWS_FILE, audio_file=AUDIO_FILE)
             if audio_file:
-                print("[OK] Audio generated: {}".format(audio_file))
+                logger.info("[OK] Audio generated: {}".format(audio_file))
                 if asset_manager:
                     asset_manager.add_asset('audio', audio_file, 'TTS audio for video',
                         source='gTTS (Google Text-to-Speech)')
             else:
-                print("[ERROR] Audio generation failed")
+                logger.error("[ERROR] Audio generation failed")
                 return False
         except Exception as e:
-            print("[ERROR] Error generating audio: {}".format(e))
-            import traceback
-            traceback.print_exc()
+            logger.exception("[ERROR] Error generating audio: {}".format(e))
             return False
     else:
-        print("\n[SKIP] Skipping audio generation (using existing audio)")
+        logger.info("\n[SKIP] Skipping audio generation (using existing audio)")
 
+    step_elapsed = time.monotonic() - step_start
+    logger.info("[INFO] Audio Generation took {:.2f}s".format(step_elapsed))
     if asset_manager:
         asset_manager.add_workflow_step('Audio Generation', 'generate', 'completed',
-            {'engine': 'gTTS', 'language': 'en'})
+            {'engine': 'gTTS', 'language': 'en',
+             'duration_seconds': round(step_elapsed, 2)})
+    step_start = time.monotonic()
     
     # Step 3: Create Videos
     if not skip_video:
-        print("\n" + "="*70)
-        print("STEP 3: Creating Videos for Multiple Platforms")
-        print("="*70)
+        logger.info("\n" + "=" * 70)
+        logger.info("STEP 3: Creating Videos for Multiple Platforms")
+        logger.info("=" * 70)
         try:
-            videos = create_multiple_formats()
+            from video_maker import create_multiple_formats
+            videos = create_multiple_formats(quality=video_quality, codec=video_codec)
             if videos:
-                print("\n[OK] Created {} video(s)".format(len(videos)))
+                logger.info("\n[OK] Created {} video(s)".format(len(videos)))
                 for video in videos:
-                    print("  - {}".format(video))
-                    if asset_manager:
-                        asset_manager.add_asset('video', video, 'Generated video file',
-                            source='MoviePy composition')
+                    logger.info("  - {}".format(video))
+                if asset_manager:
+                    asset_manager.add_assets([
+                        {'asset_type': 'video', 'filename': video,
+                         'description': 'Generated video file', 'source': 'ffmpeg ({} encode)'.format(video_quality)}
+                        for video in videos
+                    ])
             else:
-                print("[ERROR] Video creation failed")
+                logger.error("[ERROR] Video creation failed")
                 return False
         except Exception as e:
-            print("[ERROR] Error creating videos: {}".format(e))
-            import traceback
-            traceback.print_exc()
+            logger.exception("[ERROR] Error creating videos: {}".format(e))
             return False
     else:
-        print("\n[SKIP] Skipping video creation (using existing videos)")
+        logger.info("\n[SKIP] Skipping video creation (using existing videos)")
 
+    step_elapsed = time.monotonic() - step_start
+    logger.info("[INFO] Video Composition took {:.2f}s".format(step_elapsed))
     if asset_manager:
         asset_manager.add_workflow_step('Video Composition', 'compose', 'completed',
-            {'formats': 2, 'codec': 'h264'})
+            {'formats': 2, 'codec': 'h264',
+             'duration_seconds': round(step_elapsed, 2)})
+    step_start = time.monotonic()
     
     # Step 4: Upload (placeholder for future implementation)
-    print("\n" + "="*70)
-    print("STEP 4: Upload to Social Media (Manual)")
-    print("="*70)
-    print("[INFO] YouTube/TikTok upload requires OAuth setup.")
-    print("[INFO] Videos are ready in the 'output/' directory.")
-    print("[INFO] Manual upload or configure YouTube Data API for automation.")
+    logger.info("\n" + "=" * 70)
+    logger.info("STEP 4: Upload to Social Media (Manual)")
+    logger.info("=" * 70)
+    logger.info("[INFO] YouTube/TikTok upload requires OAuth setup.")
+    logger.info("[INFO] Videos are ready in the 'output/' directory.")
+    logger.info("[INFO] Manual upload or configure YouTube Data API for automation.")
     
     # Step 5: Save Asset Manifest
     if asset_manager:
-        print("\n" + "="*70)
-        print("STEP 5: Saving Asset Manifest")
-        print("="*70)
+        logger.info("\n" + "=" * 70)
+        logger.info("STEP 5: Saving Asset Manifest")
+        logger.info("=" * 70)
         try:
             manifest_file = asset_manager.save_manifest()
-            print("[OK] Asset manifest saved: {}".format(manifest_file))
+            logger.info("[OK] Asset manifest saved: {}".format(manifest_file))
         except Exception as e:
-            print("[WARNING] Asset manifest save skipped: {}".format(e))
+            logger.warning("[WARNING] Asset manifest save skipped: {}".format(e))
     
     # Summary
-    print("\n" + "="*70)
-    print("[OK] PIPELINE COMPLETED SUCCESSFULLY")
-    print("="*70)
-    print("[INFO] Output files:")
-    print("[INFO]   - Videos: output/")
-    print("[INFO]   - News: data/today_news.json")
-    print("[INFO]   - Audio: data/ai_news_audio.mp3")
-    print("[INFO]   - Manifest: data/asset_manifest_*.json")
-    print("[{}] Done!\n".format(datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    logger.info("\n" + "=" * 70)
+    logger.info("[OK] PIPELINE COMPLETED SUCCESSFULLY")
+    logger.info("=" * 70)
+    logger.info("[INFO] Output files:")
+    logger.info("[INFO]   - Videos: output/")
+    logger.info("[INFO]   - News: data/today_news.json")
+    logger.info("[INFO]   - Audio: data/ai_news_audio.mp3")
+    logger.info("[INFO]   - Manifest: data/asset_manifest_*.json")
+    pipeline_elapsed = time.monotonic() - pipeline_start
+    logger.info("[{}] Done in {:.2f}s!\n".format(
+        time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time + pipeline_elapsed)),
+        pipeline_elapsed))
+    flush_logging()
+    sys.stdout.flush()
     
     return True
 
@@ -249,6 +398,18 @@ def main():
         action='store_true',
             help='Skip video creation (use existing videos)'
     )
+    parser.add_argument(
+        '--quality',
+        choices=['draft', 'production'],
+        default='draft',
+        help='Video encode quality: draft (fast) or production (slower, smaller files)'
+    )
+    parser.add_argument(
+        '--codec',
+        choices=['libx264', 'h264_nvenc', 'auto'],
+        default='libx264',
+        help='Video encoder: libx264 (CPU), h264_nvenc (NVIDIA GPU) or auto (NVENC if available)'
+    )
     
     args = parser.parse_args()
     
@@ -256,18 +417,18 @@ def main():
         success = run_pipeline(
             skip_news=args.skip_news,
             skip_audio=args.skip_audio,
-            skip_video=args.skip_video
+            skip_video=args.skip_video,
+            video_quality=args.quality,
+            video_codec=args.codec
         )
         
         sys.exit(0 if success else 1)
         
     except KeyboardInterrupt:
-        print("\n\n[WARNING] Pipeline interrupted by user")
+        logger.warning("\n\n[WARNING] Pipeline interrupted by user")
         sys.exit(1)
     except Exception as e:
-        print("\n\n[ERROR] Fatal error: {}".format(e))
-        import traceback
-        traceback.print_exc()
+        logger.exception("\n\n[ERROR] Fatal error: {}".format(e))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -5,11 +5,18 @@ Fetches latest AI news headlines from various sources
 """
 
 import os
-import json
+import logging
+import time
 import requests
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+from json_utils import dump_json, ensure_parent_dir
+
+logger = logging.getLogger("aibytes")
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -17,6 +24,13 @@ load_dotenv()
 NEWS_API_KEY = os.getenv('NEWS_API_KEY', '')  # Get from .env or environment
 NEWS_API_URL = 'https://newsapi.org/v2/everything'
 
+# Shared HTTP session: reuses keep-alive connections and retries transient failures
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=10,
+                       max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
 def fetch_ai_news(num_articles=3):
     """
     Fetch top AI news articles
@@ -31,7 +45,7 @@ def fetch_ai_news(num_articles=3):
             'apiKey': NEWS_API_KEY
         }
         
-        response = requests.get(NEWS_API_URL, params=params, timeout=10)
+        response = _SESSION.get(NEWS_API_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -46,7 +60,7 @@ def fetch_ai_news(num_articles=3):
         return news_items
         
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching news: {e}")
+        logger.error(f"Error fetching news: {e}")
         # Fallback to sample news if API fails
         return get_sample_news()
 
@@ -61,23 +75,25 @@ def get_sample_news():
          "Industry leaders collaborate on comprehensive framework for ethical AI deployment.")
     ]
 
-def save_news_to_file(news_items, filename='data/today_news.json'):
+def save_news_to_file(news_items, filename='data/today_news.json', pretty=False):
     """
-    Save news items to JSON file
+    Save news items to JSON file (indented if pretty=True)
     """
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    ensure_parent_dir(filename)
     
+    now = time.time()
     news_data = {
-        'date': datetime.now().isoformat(),
+        'date': datetime.fromtimestamp(now).isoformat(),
+        'timestamp': now,  # Same moment as 'date', as a Unix timestamp
         'articles': news_items    }
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(news_data, f, indent=2, ensure_ascii=False)
+    dump_json(news_data, filename, pretty=pretty)
     
-    print(f"Saved {len(news_items)} news articles to {filename}")
+    logger.info(f"Saved {len(news_items)} news articles to {filename}")
     return filename
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("Fetching AI news...")
     news = fetch_ai_news(num_articles=3)
     
@@ -5,16 +5,153 @@ Text Summarizer
 Summarizes news articles into concise scripts using HuggingFace transformers
 """
 
+import hashlib
+import importlib.util
 import json
+import logging
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
-try:
-    from transformers import pipeline
-    HAS_TRANSFORMERS = True
-except ImportError:
-    HAS_TRANSFORMERS = False
-    print("[WARNING] HuggingFace transformers not installed. Using fallback summarization.")
+from json_utils import ensure_parent_dir, write_bytes
+
+logger = logging.getLogger("aibytes")
+
+# transformers (and torch) are only imported when the model is first loaded
+HAS_TRANSFORMERS = importlib.util.find_spec('transformers') is not None
+if not HAS_TRANSFORMERS:
+    logger.warning("[WARNING] HuggingFace transformers not installed. Using fallback summarization.")
+
+# HuggingFace seq2seq checkpoint used for summarization
+# (override with e.g. SUMMARIZER_MODEL=sshleifer/distilbart-xsum-1-1 for faster CPU runs)
+SUMMARIZER_MODEL = os.getenv('SUMMARIZER_MODEL', "sshleifer/distilbart-cnn-6-6")
+
+# Dynamically quantize the model's Linear layers to int8 when running on CPU
+# (set SUMMARIZER_QUANTIZE=0 to keep FP32 weights)
+SUMMARIZER_QUANTIZE = os.getenv('SUMMARIZER_QUANTIZE', '1') != '0'
+
+# Articles shorter than this (or with no description) are truncated, not summarized
+MIN_SUMMARIZE_CHARS = 180
+
+# Model summaries are cached in memory (LRU, this many entries) and on disk, keyed
+# by a hash of the model name and article text, so reruns skip the generate() call
+SUMMARY_CACHE_SIZE = 256
+SUMMARY_CACHE_DIR = 'data/.summary_cache'
+_SUMMARY_CACHE = OrderedDict()
+
+# Fixed opening and closing lines of every video script
+SCRIPT_INTRO = "Welcome to AI Tech Bytes. Here are today's top AI stories."
+SCRIPT_OUTRO = "\nThat's all for today's AI Tech Bytes. Like and subscribe for daily AI news updates!"
+
+# Input token limit for the summarizer (BART's position-embedding size);
+# longer articles are truncated by the tokenizer
+MAX_INPUT_TOKENS = 1024
+
+# Loaded on first use by _get_model() and reused for every article
+_TOKENIZER = None
+_MODEL = None
+_MODEL_LOCK = threading.Lock()
+
+
+def _get_model():
+    """
+    Return the shared (tokenizer, model), loading them on first call
+    Runs in fp16 on the GPU when CUDA is available, otherwise int8-quantized on CPU
+    Thread-safe: a call made while another thread is loading waits for that load
+    """
+    global _TOKENIZER, _MODEL
+    with _MODEL_LOCK:
+        if _MODEL is None:
+            _TOKENIZER, _MODEL = _load_model()
+    return _TOKENIZER, _MODEL
+
+
+def _load_model():
+    """Load the tokenizer and model for SUMMARIZER_MODEL"""
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    dtype = torch.float16 if device == 'cuda' else torch.float32
+    tokenizer = AutoTokenizer.from_pretrained(SUMMARIZER_MODEL)
+    model = AutoModelForSeq2SeqLM.from_pretrained(SUMMARIZER_MODEL, torch_dtype=dtype)
+    model = model.to(device).eval()
+    if device == 'cpu' and SUMMARIZER_QUANTIZE:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return tokenizer, model
+
+
+def preload_model():
+    """
+    Load the summarization model ahead of time (e.g. in a background thread
+    while news is being fetched). No-op if transformers isn't installed
+    """
+    if HAS_TRANSFORMERS:
+        _get_model()
+
+
+def _generate_summaries(texts, max_length=100, min_length=30):
+    """
+    Summarize a batch of texts with one greedy model.generate() call
+    Returns a list of summary strings in input order
+    """
+    import torch
+    tokenizer, model = _get_model()
+    inputs = tokenizer(texts, return_tensors="pt", padding='longest',
+                       truncation=True, max_length=MAX_INPUT_TOKENS)
+    inputs = inputs.to(model.device)
+    with torch.inference_mode():
+        output_ids = model.generate(**inputs, num_beams=1, max_length=max_length,
+                                    min_length=min_length, no_repeat_ngram_size=3)
+    return tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+
+
+def _summary_cache_path(text, cache_dir=SUMMARY_CACHE_DIR):
+    """
+    Path of the cached summary for this text and SUMMARIZER_MODEL
+    """
+    key = "{}|{}".format(SUMMARIZER_MODEL, text).encode('utf-8')
+    return os.path.join(cache_dir, hashlib.blake2b(key, digest_size=16).hexdigest() + '.txt')
+
+
+def _get_cached_summary(text):
+    """
+    Return the cached summary for text, or None on a miss
+    """
+    summary = _SUMMARY_CACHE.get(text)
+    if summary is not None:
+        _SUMMARY_CACHE.move_to_end(text)
+        return summary
+    
+    try:
+        with open(_summary_cache_path(text), 'rb') as f:
+            summary = f.read().decode('utf-8')
+    except OSError:
+        return None
+    
+    _remember_summary(text, summary)
+    return summary
+
+
+def _remember_summary(text, summary):
+    """Add a summary to the in-memory LRU, evicting the oldest entry when full"""
+    _SUMMARY_CACHE[text] = summary
+    _SUMMARY_CACHE.move_to_end(text)
+    if len(_SUMMARY_CACHE) > SUMMARY_CACHE_SIZE:
+        _SUMMARY_CACHE.popitem(last=False)
+
+
+def _cache_summary(text, summary):
+    """
+    Store a model summary in memory and on disk
+    """
+    _remember_summary(text, summary)
+    try:
+        cache_file = _summary_cache_path(text)
+        ensure_parent_dir(cache_file)
+        write_bytes(cache_file, summary.encode('utf-8'))
+    except OSError as e:
+        logger.warning("[WARNING] Could not write summary cache: {}".format(e))
 
 
 def summarize_text_huggingface(text, max_length=150, min_length=50):
@@ -26,40 +163,107 @@ def summarize_text_huggingface(text, max_length=150, min_length=50):
         return text[:900]  # Fallback: truncate to 900 chars
     
     try:
-        summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-6-6")
-        
-        # Split into sentences if text is too long
-        words = text.split()
-        if len(words) > 512:  # Model token limit
-            text = ' '.join(words[:512])
-        
-        summary = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)
-        return summary[0]['summary_text']
+        # Over-long text is truncated by the tokenizer (see MAX_INPUT_TOKENS)
+        return _generate_summaries([text], max_length=max_length, min_length=min_length)[0]
     except Exception as e:
-        print("[WARNING] HuggingFace summarization failed: {}. Using fallback.".format(e))
+        logger.warning("[WARNING] HuggingFace summarization failed: {}. Using fallback.".format(e))
         return text[:900]
 
 
-def summarize_article(title, description, max_chars=300):
+def _combine_article(title, description):
+    """Title and description as one text, the way articles are summarized"""
+    return "{}. {}".format(title, description) if description else title
+
+
+def _worth_summarizing(combined_text, description):
+    """False for articles too short to be worth a model call (see MIN_SUMMARIZE_CHARS)"""
+    return bool(description) and len(combined_text) >= MIN_SUMMARIZE_CHARS
+
+
+def summarize_articles(articles, max_chars=300):
     """
-    Summarize a single article
-    Returns title + concise summary
+    Summarize several articles with a single batched model call
+    
+    Args:
+        articles: List of (title, description) tuples
+        max_chars: Articles at or under this length are passed through unchanged;
+            longer ones are summarized, unless they're too short to be worth a
+            model call (see MIN_SUMMARIZE_CHARS), in which case they're truncated
+    
+    Model summaries are cached (see SUMMARY_CACHE_SIZE), so articles seen before
+    don't go through the model again
+    
+    Returns:
+        List of title + concise summary strings, in input order
     """
-    combined_text = "{}. {}".format(title, description) if description else title
+    results = []
+    pending = []  # (result index, title, combined text) for articles that need the model
     
-    if len(combined_text) <= max_chars:
-        return combined_text
+    for title, description in articles:
+        combined_text = _combine_article(title, description)
+        if len(combined_text) <= max_chars:
+            results.append(combined_text)
+        elif not _worth_summarizing(combined_text, description):
+            results.append(combined_text[:max_chars])
+        else:
+            cached = _get_cached_summary(combined_text) if HAS_TRANSFORMERS else None
+            if cached is not None:
+                results.append("{}. {}".format(title, cached))
+            else:
+                pending.append((len(results), title, combined_text))
+                results.append(combined_text[:max_chars])  # Fallback if the model is unavailable
     
     # If HuggingFace is available, use it; otherwise simple truncation
-    if HAS_TRANSFORMERS:
+    if pending and HAS_TRANSFORMERS:
         try:
-            summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-6-6")
-            summary = summarizer(combined_text[:512], max_length=100, min_length=30, do_sample=False)
-            return "{}. {}".format(title, summary[0]['summary_text'])
-        except:
-            return combined_text[:max_chars]
-    else:
-        return combined_text[:max_chars]
+            summaries = _generate_summaries([text for _, _, text in pending],
+                                            max_length=100, min_length=30)
+            for (index, title, text), summary in zip(pending, summaries):
+                results[index] = "{}. {}".format(title, summary)
+                _cache_summary(text, summary)
+        except Exception as e:
+            logger.warning("[WARNING] HuggingFace summarization failed: {}. Using truncation.".format(e))
+    
+    return results
+
+
+def summarize_article(title, description, max_chars=300):
+    """
+    Summarize a single article
+    Returns title + concise summary
+    """
+    return summarize_articles([(title, description)], max_chars)[0]
+
+
+def _article_items(news_items):
+    """(title, description) pairs for create_video_script()'s news_items"""
+    return [(item.get('title', 'AI News'), item.get('description', '')) for item in news_items]
+
+
+def _chars_per_article(news_items, max_total_chars):
+    """
+    Character budget for each article: an equal share of what's left of
+    max_total_chars after the intro and outro, with a 10% margin
+    """
+    chars_per_article = (max_total_chars - len(SCRIPT_INTRO) - len(SCRIPT_OUTRO)) // len(news_items)
+    return int(chars_per_article * 0.9)
+
+
+def script_needs_model(news_items, max_total_chars=900):
+    """
+    True if create_video_script() would run the summarization model for
+    these news items: some article is long enough to summarize and its
+    summary isn't cached. False if transformers isn't installed
+    """
+    if not HAS_TRANSFORMERS or not news_items:
+        return False
+    max_chars = _chars_per_article(news_items, max_total_chars)
+    for title, description in _article_items(news_items):
+        combined_text = _combine_article(title, description)
+        if (len(combined_text) > max_chars and _worth_summarizing(combined_text, description)
+                and _get_cached_summary(combined_text) is None):
+            return True
+    return False
 
 
 def create_video_script(news_items, max_total_chars=900):
@@ -77,18 +281,15 @@ def create_video_script(news_items, max_total_chars=900):
     if not news_items:
         return "Welcome to AI Tech Bytes. No AI news available today. Check back tomorrow for updates."
     
-    script_parts = ["Welcome to AI Tech Bytes. Here are today's top AI stories."]
-    current_length = len(script_parts[0])
+    script_parts = [SCRIPT_INTRO]
+    current_length = len(SCRIPT_INTRO)
+    outro = SCRIPT_OUTRO
     
-    for i, item in enumerate(news_items, 1):
-        title = item.get('title', 'AI News')
-        description = item.get('description', '')
-        
-        # Summarize each article to fit in the 900-char budget
-        chars_per_article = (max_total_chars - current_length) // (len(news_items) - i + 1)
-        
-        article_text = summarize_article(title, description, max_chars=int(chars_per_article * 0.9))
-        
+    # Summarize all articles in one batch, each getting an equal share of the budget
+    article_texts = summarize_articles(_article_items(news_items),
+                                       max_chars=_chars_per_article(news_items, max_total_chars))
+    
+    for i, article_text in enumerate(article_texts, 1):
         story_line = "\nStory {}: {}".format(i, article_text)
         
         if current_length + len(story_line) <= max_total_chars:
@@ -98,13 +299,12 @@ def create_video_script(news_items, max_total_chars=900):
             break
     
     # Add outro
-    outro = "\nThat's all for today's AI Tech Bytes. Like and subscribe for daily AI news updates!"
     if current_length + len(outro) <= max_total_chars:
         script_parts.append(outro)
     
     script = ''.join(script_parts)
     
-    print("[INFO] Generated script: {} characters (~{} seconds narration)".format(
+    logger.info("[INFO] Generated script: {} characters (~{} seconds narration)".format(
         len(script), int(len(script) / 15)))  # Rough estimate: 15 chars per second
     
     return script
@@ -114,16 +314,15 @@ def save_script(script, filename='data/video_script.txt'):
     """
     Save the video script to a file
     """
-    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(script)
+    ensure_parent_dir(filename)
+    write_bytes(filename, script.encode('utf-8'))
     
-    print("[OK] Script saved to: {}".format(filename))
+    logger.info("[OK] Script saved to: {}".format(filename))
     return filename
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("=== AI Tech Bytes - Text Summarizer ===\n")
     
     # Example usage
@@ -5,25 +5,41 @@ Converts news text to audio using gTTS (Google Text-to-Speech)
 """
 
 import os
+import io
+import re
 import json
+import logging
+import hashlib
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from gtts import gTTS
 from datetime import datetime
 
+from json_utils import load_json, write_bytes
+
+logger = logging.getLogger("aibytes")
+
+# Maximum number of sentences synthesized concurrently
+TTS_MAX_WORKERS = 8
+
+# Synthesized audio is cached here, keyed by a hash of the script and voice settings
+TTS_CACHE_DIR = 'data/.tts_cache'
+
 def load_news_from_file(filename='data/today_news.json'):
     """
     Load news articles from JSON file
     Returns list of (title, description) tuples
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            articles = data.get('articles', [])
-            return [(a['title'], a['description']) for a in articles]
+        data = load_json(filename)
+        articles = data.get('articles', [])
+        return [(a['title'], a['description']) for a in articles]
     except FileNotFoundError:
-        print(f"Error: File {filename} not found")
+        logger.error(f"Error: File {filename} not found")
         return []
     except json.JSONDecodeError:
-        print(f"Error: Invalid JSON in {filename}")
+        logger.error(f"Error: Invalid JSON in {filename}")
         return []
 
 def create_script_from_news(news_items):
@@ -35,44 +51,86 @@ def create_script_from_news(news_items):
         return "No news available today."
     
     # Introduction
-    script = "Welcome to AI Tech Bytes! Here are today's top AI news stories. "
+    parts = ["Welcome to AI Tech Bytes! Here are today's top AI news stories. "]
     
     # Add each news item
     for i, (title, description) in enumerate(news_items, 1):
-        script += f"\n\nStory {i}: {title}. "
+        parts.append(f"\n\nStory {i}: {title}. ")
         if description:
             # Clean up description
             desc = description.strip()
             if desc:
-                script += f"{desc} "
+                parts.append(f"{desc} ")
     
     # Outro
-    script += "\n\nThat's all for today's AI Tech Bytes. Stay tuned for more AI news tomorrow!"
+    parts.append("\n\nThat's all for today's AI Tech Bytes. Stay tuned for more AI news tomorrow!")
     
-    return script
+    return ''.join(parts)
+
+def _split_sentences(text):
+    """
+    Split text into sentences for parallel synthesis
+    """
+    return [s for s in re.split(r'(?<=[.!?])\s+', text.strip()) if s]
+
+def _synthesize(sentence, lang='en', slow=False):
+    """
+    Synthesize a single sentence with gTTS
+    Returns the MP3 bytes
+    """
+    buffer = io.BytesIO()
+    gTTS(text=sentence, lang=lang, slow=slow).write_to_fp(buffer)
+    return buffer.getvalue()
+
+def _tts_cache_path(text, lang, slow, cache_dir=TTS_CACHE_DIR):
+    """
+    Path of the cached MP3 for this script and voice settings
+    """
+    key = "{}|{}|{}".format(lang, slow, text).encode('utf-8')
+    return os.path.join(cache_dir, hashlib.blake2b(key, digest_size=16).hexdigest() + '.mp3')
 
 def text_to_speech(text, output_file='data/ai_news_audio.mp3', lang='en', slow=False):
     """
     Convert text to speech using gTTS
-    Saves audio file to specified location
+    Sentences are synthesized concurrently and their MP3 frames concatenated in order
+    Unchanged scripts are copied from the TTS cache instead of re-synthesized
+    Saves audio file to specified location, replacing it only once synthesis completes
     """
+    part_file = output_file + '.part'
     try:
         # Create output directory if it doesn't exist
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
-        # Generate TTS
-        tts = gTTS(text=text, lang=lang, slow=slow)
+        cache_file = _tts_cache_path(text, lang, slow)
+        if os.path.exists(cache_file):
+            shutil.copyfile(cache_file, output_file)
+            logger.info(f"Audio loaded from cache: {cache_file}")
+            return output_file
+        
+        sentences = _split_sentences(text) or [text]
+        synthesize = partial(_synthesize, lang=lang, slow=slow)
+        
+        # Generate TTS, writing each sentence's audio as soon as it's next in order
+        # (into a temp file, so a failed run never leaves a truncated output_file)
+        with ThreadPoolExecutor(max_workers=min(len(sentences), TTS_MAX_WORKERS)) as executor:
+            with open(part_file, 'wb') as f:
+                for audio in executor.map(synthesize, sentences):
+                    f.write(audio)
+        os.replace(part_file, output_file)
         
-        # Save to file
-        tts.save(output_file)
+        # Only cache complete files
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        shutil.copyfile(output_file, cache_file)
         
-        print(f"Audio saved to: {output_file}")
-        print(f"Duration estimate: ~{len(text.split())} words")
+        logger.info(f"Audio saved to: {output_file}")
+        logger.info(f"Duration estimate: ~{len(text.split())} words")
         
         return output_file
         
     except Exception as e:
-        print(f"Error generating TTS: {e}")
+        logger.error(f"Error generating TTS: {e}")
+        if os.path.exists(part_file):
+            os.remove(part_file)
         return None
 
 def generate_audio_from_news(news_file='data/today_news.json', 
@@ -80,30 +138,30 @@ def generate_audio_from_news(news_file='data/today_news.json',
     """
     Complete pipeline: Load news, create script, generate audio
     """
-    print("Loading news articles...")
+    logger.info("Loading news articles...")
     news_items = load_news_from_file(news_file)
     
     if not news_items:
-        print("No news items found. Using default message.")
+        logger.warning("No news items found. Using default message.")
         news_items = [("No news available", "Please check back later for updates.")]
     
-    print(f"Found {len(news_items)} news items")
+    logger.info(f"Found {len(news_items)} news items")
     
-    print("\nCreating narrative script...")
+    logger.info("\nCreating narrative script...")
     script = create_script_from_news(news_items)
     
     # Save script for reference
     script_file = audio_file.replace('.mp3', '_script.txt')
-    with open(script_file, 'w', encoding='utf-8') as f:
-        f.write(script)
-    print(f"Script saved to: {script_file}")
+    write_bytes(script_file, script.encode('utf-8'))
+    logger.info(f"Script saved to: {script_file}")
     
-    print("\nGenerating audio...")
+    logger.info("\nGenerating audio...")
     result = text_to_speech(script, audio_file)
     
     return result
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("=== AI Tech Bytes - TTS Generator ===")
     audio_path = generate_audio_from_news()
     
@@ -8,8 +8,17 @@ Uses PIL, NumPy for particle systems, smooth transitions, and dynamic effects
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import math
-import random
 import os # Make sure os is imported
+from functools import lru_cache
+
+try:
+    from numba import njit, prange, set_num_threads
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Opacity (0-255) particles are drawn with
+PARTICLE_ALPHA = 150
 
 class ParticleSystem:
     """Dynamic particle system for animated backgrounds"""
@@ -17,58 +26,212 @@ class ParticleSystem:
     def __init__(self, width, height, num_particles=50):
         self.width = width
         self.height = height
-        self.particles = []
-        for _ in range(num_particles):
-            self.particles.append({
-                'x': random.uniform(0, width),
-                'y': random.uniform(0, height),
-                'vx': random.uniform(-1, 1), # Slower particles
-                'vy': random.uniform(-1, 1),
-                'size': random.randint(2, 6),
-                'color': (random.randint(100, 200), random.randint(100, 200), 255),
-            })
+        # One array per attribute (index i is particle i), so updates run in NumPy
+        self.x = np.random.uniform(0, width, num_particles).astype(np.float32)
+        self.y = np.random.uniform(0, height, num_particles).astype(np.float32)
+        self.vx = np.random.uniform(-1, 1, num_particles).astype(np.float32) # Slower particles
+        self.vy = np.random.uniform(-1, 1, num_particles).astype(np.float32)
+        self.size = np.random.randint(2, 7, num_particles).astype(np.int16)
+        self.color = np.empty((num_particles, 3), dtype=np.uint8)
+        self.color[:, :2] = np.random.randint(100, 201, (num_particles, 2))
+        self.color[:, 2] = 255
     
     def update(self, audio_level=0.0): # <-- Accept audio_level
         """Update particle positions"""
         # Make particle speed reactive to audio
         speed_boost = 1 + (audio_level * 4) 
         
-        for p in self.particles:
-            p['x'] += p['vx'] * speed_boost
-            p['y'] += p['vy'] * speed_boost
-            
-            # Wrap around screen
-            if p['x'] < 0: p['x'] = self.width
-            if p['x'] > self.width: p['x'] = 0
-            if p['y'] < 0: p['y'] = self.height
-            if p['y'] > self.height: p['y'] = 0
+        self.x += self.vx * speed_boost
+        self.y += self.vy * speed_boost
+        
+        # Wrap around screen
+        np.mod(self.x, self.width, out=self.x)
+        np.mod(self.y, self.height, out=self.y)
     
     def draw(self, draw):
         """Draw particles on image"""
-        for p in self.particles:
-            x, y = int(p['x']), int(p['y'])
-            size = p['size']
-            color = p['color']
+        for x, y, size, color in zip(self.x.astype(int).tolist(), self.y.astype(int).tolist(),
+                                     self.size.tolist(), self.color.tolist()):
             # Use RGBA to draw with transparency
-            draw.ellipse([x-size, y-size, x+size, y+size], fill=color + (150,)) # Add alpha
+            draw.ellipse([x-size, y-size, x+size, y+size], fill=tuple(color) + (PARTICLE_ALPHA,)) # Add alpha
+    
+    def render(self, canvas):
+        """
+        Blend particles straight into an (H, W, 3) or (H, W, 4) uint8 array, in place
+        Same look as draw(), without a PIL call per particle (alpha channel is left as is)
+        """
+        alpha = PARTICLE_ALPHA / 255
+        _blend_discs(canvas, self.x.astype(np.int64), self.y.astype(np.int64), self.size,
+                     self.color.astype(np.float32) * alpha, np.full(len(self.x), alpha))
+
+def _blend_discs(canvas, xs, ys, radii, colors, alphas):
+    """
+    Alpha-blend filled discs into canvas's color channels, in place and in order
+    colors: (N, 3) premultiplied by alphas; discs are clipped at the canvas edges
+    """
+    if HAS_NUMBA:
+        _blend_discs_numba(canvas, xs.astype(np.int64), ys.astype(np.int64), radii.astype(np.int64),
+                           colors.astype(np.float32), alphas.astype(np.float64))
+        return
+    
+    for x, y, radius, color, alpha in zip(xs.tolist(), ys.tolist(), radii.tolist(), colors, alphas.tolist()):
+        _blend_stencil(canvas, x, y, _disc_stencil(radius), color, alpha)
+
+@lru_cache(maxsize=16)
+def _disc_stencil(radius):
+    """
+    Boolean (2r+1, 2r+1) mask of a filled disc
+    The 0.4 px slack matches the outline PIL's ellipse() draws for small radii
+    """
+    return np.hypot(*np.ogrid[-radius:radius+1, -radius:radius+1]) <= radius + 0.4
+
+def _blend_stencil(canvas, x, y, stencil, color, alpha):
+    """
+    Alpha-blend a stencil centred on (x, y) into canvas's color channels, in place
+    color is premultiplied by alpha; the stencil is clipped at the canvas edges
+    """
+    height, width = canvas.shape[:2]
+    radius = stencil.shape[0] // 2
+    x0, y0 = max(x - radius, 0), max(y - radius, 0)
+    x1, y1 = min(x + radius + 1, width), min(y + radius + 1, height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    mask = stencil[y0 - (y - radius):y1 - (y - radius), x0 - (x - radius):x1 - (x - radius)]
+    region = canvas[y0:y1, x0:x1, :3]
+    region[mask] = region[mask] * (1 - alpha) + color
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _blend_discs_numba(canvas, xs, ys, radii, colors, alphas):
+        """_blend_discs() kernel: rows in parallel, discs in order within each row"""
+        height, width = canvas.shape[0], canvas.shape[1]
+        for y in prange(height):
+            for i in range(xs.shape[0]):
+                radius = radii[i]
+                dy = y - ys[i]
+                if dy < -radius or dy > radius:
+                    continue
+                # Same disc as _disc_stencil()
+                limit = (radius + 0.4) * (radius + 0.4)
+                keep = 1.0 - alphas[i]
+                for x in range(max(xs[i] - radius, 0), min(xs[i] + radius + 1, width)):
+                    dx = x - xs[i]
+                    if dx * dx + dy * dy <= limit:
+                        for c in range(3):
+                            canvas[y, x, c] = np.uint8(canvas[y, x, c] * keep + colors[i, c])
+    
+    # Compile now rather than on the first video frame
+    _blend_discs_numba(np.zeros((2, 2, 3), dtype=np.uint8), np.zeros(1, dtype=np.int64),
+                       np.zeros(1, dtype=np.int64), np.ones(1, dtype=np.int64),
+                       np.zeros((1, 3), dtype=np.float32), np.zeros(1))
+
+def blend_rgba(target, rgba):
+    """
+    Alpha-blend an (h, w, 4) uint8 RGBA array into an (h, w, 3) uint8 array, in place
+    Same rounding as PIL's paste() with the image as its own mask
+    """
+    if HAS_NUMBA:
+        _blend_rgba_numba(target, rgba)
+        return
+    
+    region = rgba.astype(np.uint16)
+    alpha = region[..., 3:]
+    blended = target * (255 - alpha) + region[..., :3] * alpha + 128
+    target[...] = ((blended >> 8) + blended) >> 8
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _blend_rgba_numba(target, rgba):
+        """blend_rgba() kernel: rows in parallel, transparent pixels skipped"""
+        for y in prange(target.shape[0]):
+            for x in range(target.shape[1]):
+                alpha = np.uint32(rgba[y, x, 3])
+                if alpha == 0:
+                    continue
+                for c in range(3):
+                    blended = np.uint32(target[y, x, c]) * (255 - alpha) + np.uint32(rgba[y, x, c]) * alpha + 128
+                    target[y, x, c] = np.uint8(((blended >> 8) + blended) >> 8)
+    
+    # Compile now (for the sliced frame views it's called with, and both the writable
+    # arrays made here and the read-only ones np.asarray() gives for PIL sprites)
+    # rather than on the first video frame
+    _warmup_rgba = np.zeros((2, 2, 4), dtype=np.uint8)
+    _blend_rgba_numba(np.zeros((2, 3, 3), dtype=np.uint8)[:, :2], _warmup_rgba)
+    _warmup_rgba.setflags(write=False)
+    _blend_rgba_numba(np.zeros((2, 3, 3), dtype=np.uint8)[:, :2], _warmup_rgba)
+    del _warmup_rgba
+
+# Font files to use, in order of preference (the first one that exists wins)
+FONT_CANDIDATES = (
+    'C:\\Windows\\Fonts\\arial.ttf', # Windows
+    '/System/Library/Fonts/Arial.ttf', # macOS
+    '/System/Library/Fonts/Supplemental/Arial.ttf', # macOS
+    '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf', # Linux
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', # Linux (Debian/Ubuntu)
+    '/usr/share/fonts/TTF/DejaVuSans.ttf', # Linux (Arch)
+    'arial.ttf' # Fallback
+)
 
 # Helper to find fonts
 def get_font_path():
-    """Get available font for the system"""
-    if os.name == 'nt':  # Windows
-        return 'C:\\Windows\\Fonts\\arial.ttf'
-    else:  # macOS/Linux
-        font_paths = [
-            '/System/Library/Fonts/Arial.ttf', # macOS
-            '/System/Library/Fonts/Supplemental/Arial.ttf', # macOS
-            '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf', # Linux
-            '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', # Linux
-            'arial.ttf' # Fallback
-        ]
-        for path in font_paths:
-            if os.path.exists(path):
-                return path
-        return None # Let PIL use default
+    """Get available font for the system (None lets PIL use its default)"""
+    return next((path for path in FONT_CANDIDATES if os.path.exists(path)), None)
+
+# Resolved once; fonts are then loaded through the _font() cache
+FONT_PATH = get_font_path()
+
+# Animated font sizes are rounded to this many px so frames share cached fonts
+FONT_SIZE_STEP = 2
+
+@lru_cache(maxsize=64)
+def _font(path, size):
+    """
+    Load a TrueType font (PIL's default font if path is None or fails to load)
+    Cached, so animations don't reopen the font file every frame
+    """
+    try:
+        if path:
+            return ImageFont.truetype(path, size)
+    except Exception:
+        pass
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=4096)
+def _char_width(path, size, char):
+    """Width in px of a single character in _font(path, size)"""
+    bbox = _font(path, size).getbbox(char)
+    return bbox[2] - bbox[0]
+
+# 1x1 image whose ImageDraw is used only to measure text
+_SCRATCH_DRAW = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+
+@lru_cache(maxsize=1024)
+def _text_extent(path, size, text):
+    """(width, height) in px of text's bounding box in _font(path, size)"""
+    bbox = _SCRATCH_DRAW.textbbox((0, 0), text, font=_font(path, size))
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+# Audio-reactive glow alpha is rounded down to this step so text sprites can be reused
+GLOW_ALPHA_STEP = 10
+
+def _quantize_font_size(size):
+    """Round a font size to the nearest FONT_SIZE_STEP px (at least one step)"""
+    return max(FONT_SIZE_STEP, int(round(size / FONT_SIZE_STEP)) * FONT_SIZE_STEP)
+
+# Animated backgrounds move in this many steps over a scene's progress 0.0-1.0
+# (a 0-100 px color shift, ~1.7 px per step), so a background has at most
+# BACKGROUND_STEPS + 1 distinct frames
+BACKGROUND_STEPS = 60
+
+def _background_shift(progress):
+    """Color shift (0-100 px) of an animated background at progress, in BACKGROUND_STEPS steps"""
+    return int(progress * BACKGROUND_STEPS) * 100 // BACKGROUND_STEPS
+
+# Rendered gradients kept by _gradient_array(), one per step of one gradient, so
+# scenes that replay progress 0.0-1.0 reuse the frames rendered for earlier scenes.
+# One 720x1280 frame is ~2.7 MB (~170 MB for a full cache; ~380 MB at 1080x1920),
+# per render worker process
+GRADIENT_CACHE_SIZE = BACKGROUND_STEPS + 1
 
 def create_gradient_background(width, height, colors, direction='vertical', progress=0.0):
     """
@@ -76,43 +239,88 @@ def create_gradient_background(width, height, colors, direction='vertical', prog
     direction: 'vertical', 'horizontal', 'radial', 'diagonal'
     progress: 0.0-1.0 for animation
     """
-    img = Image.new('RGB', (width, height))
-    pixels = img.load()
-    
     # Animate color shift based on progress
-    shift = int(progress * 100)
+    shift = _background_shift(progress)
+    colors = tuple(tuple(color) for color in colors)
+    return Image.fromarray(_gradient_array(width, height, colors, direction, shift), 'RGB')
+
+@lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def _gradient_array(width, height, colors, direction, shift):
+    """
+    Render a gradient as a read-only (height, width, 3) uint8 array
+    Cached, since many frames share the same integer shift
+    """
+    # Column/row coordinate vectors; they broadcast against each other to (height, width)
+    ys = np.arange(height, dtype=np.float32)[:, None]
+    xs = np.arange(width, dtype=np.float32)[None, :]
     
-    for y in range(height):
-        for x in range(width):
-            if direction == 'vertical':
-                ratio = (y + shift) % height / height
-            elif direction == 'horizontal':
-                ratio = (x + shift) % width / width
-            elif direction == 'diagonal':
-                ratio = ((x + y + shift) % (width + height)) / (width + height)
-            else:  # radial
-                dx = x - width/2
-                dy = y - height/2
-                # Ensure division by zero doesn't happen if width is 0
-                max_radius = width / 2
-                if max_radius == 0: max_radius = 1 
-                dist = math.sqrt(dx*dx + dy*dy)
-                ratio = (dist + shift) % max_radius / max_radius
-            
-            # Interpolate between colors
-            color_index = ratio * (len(colors) - 1)
-            idx1 = int(color_index)
-            idx2 = min(idx1 + 1, len(colors) - 1)
-            local_ratio = color_index - idx1
-            
-            c1, c2 = colors[idx1], colors[idx2]
-            r = int(c1[0] + (c2[0] - c1[0]) * local_ratio)
-            g = int(c1[1] + (c2[1] - c1[1]) * local_ratio)
-            b = int(c1[2] + (c2[2] - c1[2]) * local_ratio)
-            
-            pixels[x, y] = (r, g, b)
+    if direction == 'vertical':
+        ratio = (ys + shift) % height / height
+    elif direction == 'horizontal':
+        ratio = (xs + shift) % width / width
+    elif direction == 'diagonal':
+        # Color depends only on x + y: interpolate each of the width + height - 1
+        # sums once, then gather the table into the frame
+        sums = np.arange(width + height - 1, dtype=np.float32)
+        table = _interpolate_palette(colors, (sums + shift) % (width + height) / (width + height))
+        rgb = table[np.arange(height)[:, None] + np.arange(width)[None, :]].astype(np.uint8)
+        rgb.setflags(write=False)  # Shared between callers via the cache
+        return rgb
+    else:  # radial
+        # Ensure division by zero doesn't happen if width is 0
+        max_radius = width / 2
+        if max_radius == 0: max_radius = 1
+        if HAS_NUMBA:
+            rgb = np.empty((height, width, 3), dtype=np.uint8)
+            _radial_gradient_numba(rgb, np.array(colors, dtype=np.uint16), shift, max_radius)
+            rgb.setflags(write=False)
+            return rgb
+        dist = np.hypot(xs - width / 2, ys - height / 2)
+        ratio = (dist + shift) % max_radius / max_radius
     
-    return img
+    rgb = _interpolate_palette(colors, ratio)
+    
+    # Row/column-only gradients are expanded to the full frame here
+    rgb = np.ascontiguousarray(np.broadcast_to(rgb, (height, width, 3)), dtype=np.uint8)
+    rgb.setflags(write=False)  # Shared between callers via the cache
+    return rgb
+
+def _interpolate_palette(colors, ratio):
+    """
+    Colors at ratio (0.0-1.0, any shape) along the palette, as a ratio.shape + (3,) uint16 array
+    """
+    # Interpolate between colors for every value at once, in 8-bit fixed point
+    # (uint16 intermediates instead of float32: half the memory traffic)
+    palette = np.array(colors, dtype=np.uint16)
+    color_index = ratio * (len(colors) - 1)
+    idx1 = color_index.astype(np.int32)
+    idx2 = np.minimum(idx1 + 1, len(colors) - 1)
+    weight = ((color_index - idx1) * 256).astype(np.uint16)[..., None]
+    
+    return (palette[idx1] * (256 - weight) + palette[idx2] * weight) >> 8
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _radial_gradient_numba(out, palette, shift, max_radius):
+        """Fill out ((H, W, 3) uint8) with the radial gradient, rows in parallel"""
+        height, width = out.shape[0], out.shape[1]
+        last = palette.shape[0] - 1
+        for y in prange(height):
+            dy = y - height / 2
+            for x in range(width):
+                dx = x - width / 2
+                dist = math.sqrt(dx * dx + dy * dy)
+                color_index = (dist + shift) % max_radius / max_radius * last
+                idx1 = int(color_index)
+                idx2 = min(idx1 + 1, last)
+                # 8-bit fixed-point weight, as in the NumPy path
+                weight = int((color_index - idx1) * 256)
+                for c in range(3):
+                    out[y, x, c] = np.uint8((palette[idx1, c] * (256 - weight) + palette[idx2, c] * weight) >> 8)
+    
+    # Compile now rather than on the first video frame
+    _radial_gradient_numba(np.empty((2, 2, 3), dtype=np.uint8),
+                           np.zeros((2, 3), dtype=np.uint16), 0, 1.0)
 
 def create_animated_text(width, height, text, font_size=60, progress=0.0, effect='slide', audio_level=0.0):
     """
@@ -120,20 +328,18 @@ def create_animated_text(width, height, text, font_size=60, progress=0.0, effect
     effect: 'slide', 'zoom', 'fade', 'wave', 'pulse'
     """
     img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    try:
-        font_path = get_font_path()
-        if font_path:
-            font = ImageFont.truetype(font_path, font_size)
-        else:
-            font = ImageFont.load_default()
-    except Exception:
-        font = ImageFont.load_default()
-    
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
+    sprite, position = create_animated_text_sprite(width, height, text, font_size, progress, effect, audio_level)
+    img.paste(sprite, position)
+    return img
+
+def create_animated_text_sprite(width, height, text, font_size=60, progress=0.0, effect='slide', audio_level=0.0):
+    """
+    Same as create_animated_text(), as (sprite, (x, y)): an RGBA image to paste
+    at (x, y) on the frame, which may hang off its edges
+    Sprites are cached, so frames that repeat a text size/glow reuse one render
+    """
+    text_size = font_size
+    text_width, text_height = _text_extent(FONT_PATH, font_size, text)
     
     # Default position
     x = (width - text_width) // 2
@@ -146,68 +352,112 @@ def create_animated_text(width, height, text, font_size=60, progress=0.0, effect
     elif effect == 'zoom':
         # Zoom in effect
         scale = 0.1 + 0.9 * progress
-        temp_font_size = int(font_size * scale)
-        try:
-            if font_path:
-                font = ImageFont.truetype(font_path, temp_font_size)
-            else:
-                font = ImageFont.load_default()
-        except Exception:
-            font = ImageFont.load_default()
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_size = _quantize_font_size(font_size * scale)
+        text_width, text_height = _text_extent(FONT_PATH, text_size, text)
         x = (width - text_width) // 2
         y = (height - text_height) // 2
 
     elif effect == 'wave':
-        # Wave effect - draw character by character
-        start_x = (width - text_width) // 2
-        current_x = start_x
-        for i, char in enumerate(text):
-            char_y = y + int(10 * math.sin(progress * math.pi * 2 + i * 0.5))
-            draw.text((current_x, char_y), char, font=font, fill=(255, 255, 255, 255))
-            char_bbox = draw.textbbox((0, 0), char, font=font)
-            current_x += char_bbox[2] - char_bbox[0]
-        return img # Return early as text is already drawn
+        # Wave effect - draw character by character, on a sprite with room for
+        # the +/-10px wave and any glyph overhang
+        advances = [_char_width(FONT_PATH, font_size, char) for char in text]
+        margin = font_size + 10
+        img = Image.new('RGBA', (sum(advances) + 2 * margin, font_size + 2 * margin), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        font = _font(FONT_PATH, font_size)
+        current_x = margin
+        offsets = (10 * np.sin(progress * math.pi * 2 + np.arange(len(text)) * 0.5)).astype(int)
+        for char, offset, advance in zip(text, offsets.tolist(), advances):
+            draw.text((current_x, margin + offset), char, font=font, fill=(255, 255, 255, 255))
+            current_x += advance
+        return img, ((width - text_width) // 2 - margin, y - margin) # Return early as text is already drawn
     
     elif effect == 'pulse':
         # Pulse effect based on audio
         scale = 1.0 + (audio_level * 0.2) # Pulse 20%
-        temp_font_size = int(font_size * scale)
-        try:
-            if font_path:
-                font = ImageFont.truetype(font_path, temp_font_size)
-            else:
-                font = ImageFont.load_default()
-        except Exception:
-            font = ImageFont.load_default()
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        text_size = _quantize_font_size(font_size * scale)
+        text_width, text_height = _text_extent(FONT_PATH, text_size, text)
         x = (width - text_width) // 2
         y = (height - text_height) // 2
         alpha = 255
         
     else:  # fade
         alpha = int(255 * progress)
-        draw.text((x, y), text, font=font, fill=(255, 255, 255, alpha))
-        return img # Return early
+        sprite, (left, top) = _text_sprite(text, font_size)
+        return _fade_sprite(sprite, alpha), (x + left, y + top) # Return early
 
-    # Draw text with glow effect (for non-wave/fade)
+    # Text with glow effect (for non-wave/fade), from a cached sprite
     glow_alpha = int(100 + 100 * audio_level) # Glow pulses with audio
+    glow_alpha -= glow_alpha % GLOW_ALPHA_STEP
+    sprite, (left, top) = _glow_text_sprite(text, text_size, glow_alpha)
+    return sprite, (x + left, y + top)
+
+@lru_cache(maxsize=128)
+def _text_sprite(text, font_size):
+    """
+    Render opaque white text once, on a transparent image just large enough
+    Returns (sprite, (left, top)) like _glow_text_sprite()
+    """
+    font = _font(FONT_PATH, font_size)
+    left, top, right, bottom = _SCRATCH_DRAW.textbbox((0, 0), text, font=font)
+    sprite = Image.new('RGBA', (max(right - left, 1), max(bottom - top, 1)), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).text((-left, -top), text, font=font, fill=(255, 255, 255, 255))
+    return sprite, (left, top)
+
+def _fade_sprite(sprite, alpha):
+    """
+    Scale an opaque text sprite's alpha channel by alpha/255 in NumPy
+    (same rounding as drawing the text with that fill alpha)
+    """
+    if alpha >= 255:
+        return sprite
+    faded = np.array(sprite)
+    scaled = faded[..., 3].astype(np.uint16) * alpha + 128
+    faded[..., 3] = ((scaled >> 8) + scaled) >> 8
+    return Image.fromarray(faded, 'RGBA')
+
+@lru_cache(maxsize=128)
+def _glow_text_sprite(text, font_size, glow_alpha):
+    """
+    Render text with its glow once, on a transparent image just large enough
+    Returns (sprite, (left, top)): paste the sprite at (x + left, y + top) to get
+    the same pixels as drawing the text at (x, y)
+    """
+    font = _font(FONT_PATH, font_size)
+    bbox = _SCRATCH_DRAW.textbbox((0, 0), text, font=font)
+    left, top = bbox[0] - 2, bbox[1] - 2
+    sprite = Image.new('RGBA', (bbox[2] - left + 2, bbox[3] - top + 2), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sprite)
     for offset in [(2, 2), (-2, -2), (2, -2), (-2, 2)]:
-        draw.text((x + offset[0], y + offset[1]), text, font=font, fill=(0, 100, 255, glow_alpha))
-    draw.text((x, y), text, font=font, fill=(255, 255, 255, 255))
-    
-    return img
+        draw.text((offset[0] - left, offset[1] - top), text, font=font, fill=(0, 100, 255, glow_alpha))
+    draw.text((-left, -top), text, font=font, fill=(255, 255, 255, 255))
+    return sprite, (left, top)
+
+# Vertex angles (degrees) of a hexagon, before rotation
+_HEXAGON_ANGLES = np.arange(6) * 60
+
+# Shapes stay within this many px of the frame centre (the largest is the outer
+# hexagon: 250 px radius at audio_level 1.0, plus its outline)
+SHAPES_EXTENT = 256
+
+def shapes_box(width, height):
+    """(left, top, right, bottom) of the frame region create_animated_shapes() draws in"""
+    cx, cy = width // 2, height // 2
+    return (max(cx - SHAPES_EXTENT, 0), max(cy - SHAPES_EXTENT, 0),
+            min(cx + SHAPES_EXTENT + 1, width), min(cy + SHAPES_EXTENT + 1, height))
 
-def create_animated_shapes(width, height, progress=0.0, shape_type='hexagon', audio_level=0.0):
+def create_animated_shapes(width, height, progress=0.0, shape_type='hexagon', audio_level=0.0, out=None):
     """
     Create animated geometric shapes
     shape_type: 'hexagon', 'circles', 'lines', 'grid'
+    out: optional (width, height) RGBA image to reuse; its shapes_box() region is
+        cleared and drawn into, the rest is left untouched
     """
-    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    if out is None:
+        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    else:
+        img = out
+        img.paste((0, 0, 0, 0), shapes_box(width, height))
     draw = ImageDraw.Draw(img)
     
     cx, cy = width // 2, height // 2
@@ -219,12 +469,9 @@ def create_animated_shapes(width, height, progress=0.0, shape_type='hexagon', au
             radius_boost = 30 * audio_level
             radius = (100 + radius_boost) + i * 60
             angle_offset = progress * 360 + i * 20
-            points = []
-            for j in range(6):
-                angle = math.radians(angle_offset + j * 60)
-                x = cx + radius * math.cos(angle)
-                y = cy + radius * math.sin(angle)
-                points.append((x, y))
+            angles = np.radians(angle_offset + _HEXAGON_ANGLES)
+            points = list(zip((cx + radius * np.cos(angles)).tolist(),
+                              (cy + radius * np.sin(angles)).tolist()))
             draw.polygon(points, outline=(0, 150 + i*30, 255), width=3)
     
     elif shape_type == 'circles':
@@ -242,17 +489,15 @@ def create_animated_shapes(width, height, progress=0.0, shape_type='hexagon', au
     elif shape_type == 'lines':
         # Animated connection lines
         num_points = 8
-        points = []
         radius = 150 + 50 * audio_level # Make cloud expand with audio
-        for i in range(num_points):
-            angle = math.radians(i * 360 / num_points + progress * 180)
-            x = cx + radius * math.cos(angle)
-            y = cy + radius * math.sin(angle)
-            points.append((int(x), int(y)))
+        angles = np.radians(np.arange(num_points) * 360 / num_points + progress * 180)
+        xs = (cx + radius * np.cos(angles)).astype(int)
+        ys = (cy + radius * np.sin(angles)).astype(int)
         
-        for i in range(len(points)):
-            for j in range(i+1, len(points)):
-                draw.line([points[i], points[j]], fill=(0, 150, 255, 100), width=1)
+        # Every pair of points, gathered in one go
+        i, j = np.triu_indices(num_points, k=1)
+        for x1, y1, x2, y2 in np.stack((xs[i], ys[i], xs[j], ys[j]), axis=1).tolist():
+            draw.line([(x1, y1), (x2, y2)], fill=(0, 150, 255, 100), width=1)
     
     return img
 
@@ -260,28 +505,78 @@ def create_tech_background(width, height, progress=0.0, audio_level=0.0):
     """
     Create animated tech-themed background with grid and particles
     """
-    # Create base gradient
-    colors = [(10, 10, 30), (30, 30, 60), (20, 40, 80), (10, 10, 30)]
-    img = create_gradient_background(width, height, colors, 'radial', progress)
+    return Image.fromarray(render_tech_background(width, height, progress, audio_level), 'RGB')
+
+# Gradient-plus-grid frames kept by _tech_grid_array(). The gradient and grid move in
+# BACKGROUND_STEPS steps, so this holds every frame of a scene (same memory per
+# worker as GRADIENT_CACHE_SIZE; the pipeline only fills this one)
+TECH_BACKGROUND_CACHE_SIZE = BACKGROUND_STEPS + 1
+
+# Tech background colors and grid spacing (px)
+TECH_BACKGROUND_COLORS = ((10, 10, 30), (30, 30, 60), (20, 40, 80), (10, 10, 30))
+GRID_SPACING = 50
+
+def render_tech_background(width, height, progress=0.0, audio_level=0.0):
+    """
+    Same as create_tech_background(), as a writable (height, width, 3) uint8 array
+    so further layers can be drawn into it without a PIL round-trip
+    """
+    # Gradient and grid lines depend only on the quantized progress, so start from
+    # a writable copy of the cached frame
+    step = int(progress * BACKGROUND_STEPS)
+    shift = _background_shift(progress)
+    offset = step * GRID_SPACING // BACKGROUND_STEPS % GRID_SPACING
+    canvas = np.array(_tech_grid_array(width, height, shift, offset))
     
-    draw = ImageDraw.Draw(img, 'RGBA')
+    # Add glowing dots at intersections
+    dot_xs, dot_ys = _grid_dots(width, height, offset)
+    # Make intensity pulse with audio
+    intensity = int(100 + 155 * audio_level)
+    dot_alpha = int(150 + 105 * audio_level) / 255
+    dot_color = np.array((0, intensity, 255), dtype=np.float32) * dot_alpha
+    num_dots = len(dot_xs)
+    _blend_discs(canvas, dot_xs, dot_ys, np.full(num_dots, 3),
+                 np.tile(dot_color, (num_dots, 1)), np.full(num_dots, dot_alpha))
     
-    # Draw animated grid
-    grid_spacing = 50
-    offset = int(progress * grid_spacing) % grid_spacing
+    return canvas
+
+@lru_cache(maxsize=TECH_BACKGROUND_CACHE_SIZE)
+def _grid_dots(width, height, offset):
+    """
+    Positions of the glowing grid dots for a grid offset, as read-only (xs, ys) arrays
+    The pattern is fixed, so it's computed once per offset rather than every frame
+    """
+    grid_spacing = GRID_SPACING
+    xs = np.arange(-grid_spacing + offset, width + grid_spacing, grid_spacing)
+    ys = np.arange(-grid_spacing + offset, height + grid_spacing, grid_spacing)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    dots = (grid_x + grid_y) % (grid_spacing * 2) == 0 # More structured placement
     
-    for x in range(-grid_spacing + offset, width + grid_spacing, grid_spacing):
-        draw.line([(x, 0), (x, height)], fill=(30, 50, 100, 50), width=1)
-    for y in range(-grid_spacing + offset, height + grid_spacing, grid_spacing):
-        draw.line([(0, y), (width, y)], fill=(30, 50, 100, 50), width=1)
+    dot_xs, dot_ys = grid_x[dots], grid_y[dots]
+    dot_xs.setflags(write=False)
+    dot_ys.setflags(write=False)
+    return dot_xs, dot_ys
+
+@lru_cache(maxsize=TECH_BACKGROUND_CACHE_SIZE)
+def _tech_grid_array(width, height, shift, offset):
+    """
+    Radial gradient with the animated grid lines, as a read-only (height, width, 3) uint8 array
+    """
+    # Rendered uncached: this cache already holds one copy of each gradient
+    canvas = _gradient_array.__wrapped__(width, height, TECH_BACKGROUND_COLORS, 'radial', shift)
+    canvas.setflags(write=True)
     
-    # Add glowing dots at intersections
-    for x in range(-grid_spacing + offset, width + grid_spacing, grid_spacing):
-        for y in range(-grid_spacing + offset, height + grid_spacing, grid_spacing):
-            if (x + y) % (grid_spacing * 2) == 0: # More structured placement
-                # Make intensity pulse with audio
-                intensity = int(100 + 155 * audio_level)
-                alpha = int(150 + 105 * audio_level)
-                draw.ellipse([x-3, y-3, x+3, y+3], fill=(0, intensity, 255, alpha))
+    grid_spacing = GRID_SPACING
+    xs = np.arange(-grid_spacing + offset, width + grid_spacing, grid_spacing)
+    ys = np.arange(-grid_spacing + offset, height + grid_spacing, grid_spacing)
     
-    return img
+    # Blend every grid column, then every row (intersections get both, as before)
+    line_alpha = 50 / 255
+    line_color = np.array((30, 50, 100), dtype=np.float32) * line_alpha
+    columns = xs[(xs >= 0) & (xs < width)]
+    rows = ys[(ys >= 0) & (ys < height)]
+    canvas[:, columns] = canvas[:, columns] * (1 - line_alpha) + line_color
+    canvas[rows] = canvas[rows] * (1 - line_alpha) + line_color
+    
+    canvas.setflags(write=False)
+    return canvas
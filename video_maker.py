@@ -6,15 +6,24 @@ Enhanced with professional animations from video_animations module (particles, s
 """
 
 import os
+import copy
 import json
+import logging
 import math
+import subprocess
+import textwrap
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-from moviepy.editor import (
-    AudioFileClip, ImageClip, CompositeVideoClip, concatenate_videoclips
-)
+from PIL import Image
+import imageio_ffmpeg
 import librosa # <-- Import librosa
 import video_animations as va # <-- Import your animations file
+from json_utils import load_json
+
+logger = logging.getLogger("aibytes")
 
 # Video settings for social media
 VIDEO_SETTINGS = {
@@ -23,148 +32,381 @@ VIDEO_SETTINGS = {
     'youtube': {'width': 1920, 'height': 1080, 'fps': 15},         # 16:9
 }
 
-# This function is now a helper, we will call the enhanced one
-def create_frame_with_text(width, height, text, bg_color=(20, 20, 40), text_color='white', font_size=50):
-    img = Image.new('RGB', (width, height), color=bg_color)
-    draw = ImageDraw.Draw(img)
+# Worker processes that render frames in parallel (1 renders in this process,
+# 0 uses every CPU core). Each worker keeps its own background caches, so this
+# is capped by default
+RENDER_WORKERS = int(os.getenv('VIDEO_RENDER_WORKERS', min(os.cpu_count() or 1, 4))) or (os.cpu_count() or 1)
+
+# x264 settings per output quality: 'draft' favours encode speed,
+# 'production' spends more encode time for a smaller, cleaner file
+VIDEO_QUALITY = {
+    'draft': {'preset': 'ultrafast', 'crf': 23},
+    'production': {'preset': 'slow', 'crf': 20},
+}
+
+# NVENC (NVIDIA GPU H.264 encoder) settings per output quality, the GPU
+# counterpart of VIDEO_QUALITY: p1 is NVENC's fastest preset, p6 a slow, high-quality one
+NVENC_QUALITY = {
+    'draft': {'preset': 'p1', 'cq': 23},
+    'production': {'preset': 'p6', 'cq': 20},
+}
+
+# Video codecs create_video_from_audio() accepts ('auto' picks h264_nvenc when it works)
+VIDEO_CODECS = ('libx264', 'h264_nvenc', 'auto')
+
+# Narration files already in AAC are copied into the MP4 as-is; anything else
+# (e.g. gTTS's MP3) is encoded to AAC, the audio codec upload targets expect
+AAC_AUDIO_EXTENSIONS = ('.aac', '.m4a')
+
+@lru_cache(maxsize=None)
+def has_nvenc():
+    """
+    True if ffmpeg can encode with h264_nvenc on this machine
+    Probed with a tiny test encode, since ffmpeg builds list NVENC even without an NVIDIA GPU
+    """
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(), '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+        '-c:v', 'h264_nvenc', '-f', 'null', '-'
+    ]
     try:
-        font_path = va.get_font_path()
-        if font_path:
-            font = ImageFont.truetype(font_path, font_size)
-        else:
-            font = ImageFont.load_default()
-    except Exception:
-        font = ImageFont.load_default()
+        return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              timeout=30).returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+def resolve_codec(codec):
+    """Return codec, with 'auto' replaced by h264_nvenc if it's usable, else libx264"""
+    if codec == 'auto':
+        return 'h264_nvenc' if has_nvenc() else 'libx264'
+    return codec
+
+def video_encoder_options(codec, quality):
+    """ffmpeg video encoder arguments for codec ('libx264' or 'h264_nvenc') at quality"""
+    if codec == 'h264_nvenc':
+        encoder = NVENC_QUALITY[quality]
+        return ['-c:v', 'h264_nvenc', '-preset', encoder['preset'],
+                '-rc', 'vbr', '-cq', str(encoder['cq']), '-b:v', '0']
+    encoder = VIDEO_QUALITY[quality]
+    return ['-c:v', 'libx264', '-preset', encoder['preset'], '-crf', str(encoder['crf'])]
+
+def audio_encoder_options(audio_file):
+    """ffmpeg audio encoder arguments for muxing audio_file into an MP4 (see AAC_AUDIO_EXTENSIONS)"""
+    if audio_file.lower().endswith(AAC_AUDIO_EXTENSIONS):
+        return ['-c:a', 'copy']
+    return ['-c:a', 'aac']
+
+def start_ffmpeg_writer(output_file, width, height, fps, audio_file, quality='draft', scaled_outputs=(),
+                        codec='libx264'):
+    """
+    Start one ffmpeg process that encodes raw RGB frames written to its stdin
+    and muxes them with audio_file, so frames never go through MoviePy
+    quality: a VIDEO_QUALITY key
+    scaled_outputs: extra (output_file, width, height) encodes of the same frames,
+        resized by ffmpeg in the same process
+    codec: 'libx264' (CPU) or 'h264_nvenc' (NVIDIA GPU)
+    """
+    output_options = video_encoder_options(codec, quality) + audio_encoder_options(audio_file) + [
+        '-pix_fmt', 'yuv420p',
+        '-shortest',
+        # Put the MP4 index at the front so playback can start before the whole file loads
+        '-movflags', '+faststart',
+    ]
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-loglevel', 'error',
+        # Video: raw frames from stdin
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+        # Audio: the narration track
+        '-i', audio_file,
+    ]
+    
+    if not scaled_outputs:
+        command += ['-map', '0:v', '-map', '1:a'] + output_options + [output_file]
+        return subprocess.Popen(command, stdin=subprocess.PIPE)
     
-    bbox = draw.textbbox((0, 0), text, font=font, align="center")
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-    x = (width - text_width) // 2
-    y = (height - text_height) // 2
+    # Split the frame stream: [v0] is encoded as-is, [v1]... are scaled for the extra outputs
+    num_outputs = len(scaled_outputs) + 1
+    filters = ['[0:v]split={}{}'.format(num_outputs, ''.join(f'[v{i}]' for i in range(num_outputs)))]
+    filters += [f'[v{i}]scale={w}:{h}[s{i}]' for i, (_, w, h) in enumerate(scaled_outputs, 1)]
+    command += ['-filter_complex', ';'.join(filters)]
     
-    draw.text((x, y), text, font=font, fill=text_color, align="center")
-    return np.array(img)
+    command += ['-map', '[v0]', '-map', '1:a'] + output_options + [output_file]
+    for i, (scaled_file, _, _) in enumerate(scaled_outputs, 1):
+        command += ['-map', f'[s{i}]', '-map', '1:a'] + output_options + [scaled_file]
+    return subprocess.Popen(command, stdin=subprocess.PIPE)
 
+def finish_ffmpeg_writer(process):
+    """
+    Close ffmpeg's input and wait for it to finish writing the file
+    Raises RuntimeError if ffmpeg failed
+    """
+    process.stdin.close()
+    returncode = process.wait()
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with code {returncode}")
 
-def create_animated_scene(width, height, particle_system, text, text_effect='pulse', shape='circles', progress=0.0, audio_level=0.0):
+
+def paste_sprite(canvas, sprite, position):
     """
-    Creates a single, fully composited frame for intro/outro.
-    This combines background, particles, shapes, and text.
+    Alpha-composite an RGBA sprite into an (height, width, 3) uint8 array in place,
+    with its top-left corner at position (clipped to the canvas; same rounding as PIL's paste)
+    """
+    x, y = position
+    height, width = canvas.shape[:2]
+    left, top = max(x, 0), max(y, 0)
+    right, bottom = min(x + sprite.width, width), min(y + sprite.height, height)
+    if left >= right or top >= bottom:
+        return
+    
+    if (left, top, right, bottom) != (x, y, x + sprite.width, y + sprite.height):
+        sprite = sprite.crop((left - x, top - y, right - x, bottom - y))
+    va.blend_rgba(canvas[top:bottom, left:right], np.asarray(sprite))
+
+@lru_cache(maxsize=4)
+def _shapes_layer(width, height):
+    """Transparent RGBA image reused for every frame's shapes at this size"""
+    return Image.new('RGBA', (width, height), (0, 0, 0, 0))
+
+def render_scene_base(width, height, particle_system, shape, progress=0.0, audio_level=0.0):
+    """
+    Background, particles and shapes for one frame, built on a single canvas
+    Returns a writable (height, width, 3) uint8 array ready for the text overlay
     """
-    # 1. Create animated background
-    base_img = va.create_tech_background(width, height, progress, audio_level)
+    canvas = va.render_tech_background(width, height, progress, audio_level)
     
-    # 2. Update and draw particle system
+    # Particles are blended straight into the background array
     particle_system.update(audio_level)
-    draw = ImageDraw.Draw(base_img, 'RGBA')
-    particle_system.draw(draw)
+    particle_system.render(canvas)
     
-    # 3. Create and composite animated shapes
-    shapes_img = va.create_animated_shapes(width, height, progress, shape, audio_level)
-    base_img.paste(shapes_img, (0, 0), shapes_img) # Paste with alpha
+    # Shapes are drawn on a reused layer; only the region they can reach is blended
+    shapes_img = va.create_animated_shapes(width, height, progress, shape, audio_level,
+                                           out=_shapes_layer(width, height))
+    box = va.shapes_box(width, height)
+    paste_sprite(canvas, shapes_img.crop(box), box[:2])
+    return canvas
+
+def create_animated_scene(width, height, particle_system, text, text_effect='pulse', shape='circles', progress=0.0, audio_level=0.0):
+    """
+    Creates a single, fully composited frame for intro/outro.
+    This combines background, particles, shapes, and text.
+    """
+    # 1-3. Background, particles and shapes
+    frame = render_scene_base(width, height, particle_system, shape, progress, audio_level)
     
     # 4. Create and composite animated text
     font_size = 80 if width < 1200 else 100 # Larger font for title
-    text_img = va.create_animated_text(width, height, text, font_size, progress, text_effect, audio_level)
-    base_img.paste(text_img, (0, 0), text_img) # Paste with alpha
+    text_sprite, position = va.create_animated_text_sprite(width, height, text, font_size, progress, text_effect, audio_level)
+    paste_sprite(frame, text_sprite, position)
     
-    return np.array(base_img)
+    return frame
+
+def wrap_news_title(news_title, max_chars=40, max_lines=3):
+    """Word-wrap a news title to at most max_lines lines of max_chars characters"""
+    return "\n".join(textwrap.wrap(news_title, width=max_chars)[:max_lines])
 
-def create_animated_news_frame_enhanced(width, height, particle_system, news_title, progress=0.0, audio_level=0.0):
+def create_animated_news_frame_enhanced(width, height, particle_system, news_title, progress=0.0, audio_level=0.0,
+                                        wrapped_text=None):
     """
     Enhanced animated frame with professional effects from video_animations module
+    wrapped_text: news_title already passed through wrap_news_title(), to skip
+        re-wrapping it on every frame
     """
-    # 1. Create tech background
-    base_img = va.create_tech_background(width, height, progress, audio_level)
-    
-    # 2. Update and draw particle system
-    particle_system.update(audio_level)
-    draw = ImageDraw.Draw(base_img, 'RGBA')
-    particle_system.draw(draw)
-    
-    # 3. Add animated shapes for visual interest
-    shapes_img = va.create_animated_shapes(width, height, progress, 'hexagon', audio_level)
-    base_img.paste(shapes_img, (0, 0), shapes_img)
+    # 1-3. Tech background, particles and hexagons for visual interest
+    frame = render_scene_base(width, height, particle_system, 'hexagon', progress, audio_level)
     
     # 4. Add animated text overlay (wrapped)
     font_size = 45 if width < 1200 else 60
+    if wrapped_text is None:
+        wrapped_text = wrap_news_title(news_title)
+    
+    text_sprite, position = va.create_animated_text_sprite(width, height, wrapped_text, font_size, progress, 'slide', audio_level)
+    paste_sprite(frame, text_sprite, position)
+    
+    return frame
+
+
+# Particle system owned by this (worker) process, see _init_render_worker()
+_WORKER_PARTICLES = None
+
+def _init_render_worker(particle_system):
+    """Pool initializer: keep a particle system to restore frame snapshots into"""
+    global _WORKER_PARTICLES
+    _WORKER_PARTICLES = particle_system
+    if va.HAS_NUMBA and multiprocessing.parent_process() is not None:
+        va.set_num_threads(1)  # The pool already uses every core it's given
+
+def _render_frame(spec):
+    """
+    Render one frame from a frame_spec() spec
+    The particles are restored to the frame's starting state first, so a frame
+    comes out the same whichever process renders it
+    """
+    builder, kwargs, particle_x, particle_y = spec
+    _WORKER_PARTICLES.x[:] = particle_x
+    _WORKER_PARTICLES.y[:] = particle_y
+    return builder(particle_system=_WORKER_PARTICLES, **kwargs)
+
+def frame_spec(particle_system, builder, **kwargs):
+    """
+    Describe one frame for write_frames(), along with the particle state it
+    starts from, then advance particle_system the way the frame builder will
+    """
+    spec = (builder, kwargs, particle_system.x.copy(), particle_system.y.copy())
+    particle_system.update(kwargs['audio_level'])
+    return spec
+
+def generate_frame_specs(width, height, fps, particle_system, amplitude_frames,
+                         news_items, intro_duration, duration_per_article):
+    """
+    Yield a frame_spec() for every video frame, in order: intro, one segment
+    per news item, then outro filling the rest of amplitude_frames
+    Per-frame parameters are laid out as arrays up front; the specs themselves
+    are made on demand, so no frame data is held for the whole video
+    """
+    total_video_frames = len(amplitude_frames)
+    
+    # Segments in order as (builder, fixed kwargs, frame count)
+    segments = [(create_animated_scene, dict(
+        text="AI TECH BYTES\nDaily News Update", text_effect='zoom', shape='lines'
+    ), int(intro_duration * fps))]
+    for idx, news_item in enumerate(news_items):
+        news_title = f"Story {idx + 1}: {news_item.get('title', 'AI News')}"
+        segments.append((create_animated_news_frame_enhanced, dict(
+            news_title=news_title,
+            wrapped_text=wrap_news_title(news_title) # Once per article, not per frame
+        ), int(duration_per_article * fps)))
+    # Fill remaining time with outro
+    used_frames = min(total_video_frames, sum(count for _, _, count in segments))
+    segments.append((create_animated_scene, dict(
+        text="Thanks for watching!\nSubscribe for more.", text_effect='fade', shape='circles'
+    ), total_video_frames - used_frames))
+    
+    # Which segment each frame belongs to, and its 0..1 progress through it
+    counts = [count for _, _, count in segments]
+    segment_index = np.repeat(np.arange(len(segments)), counts)[:total_video_frames]
+    progress = np.concatenate([
+        np.arange(count) / (count - 1) if count > 1 else np.zeros(count) for count in counts
+    ])[:total_video_frames]
     
-    # Simple word wrapping
-    max_chars = 40
-    words = news_title.split()
-    lines = []
-    current_line = ""
-    for word in words:
-        if len(current_line) + len(word) + 1 <= max_chars:
-            current_line += word + " "
-        else:
-            lines.append(current_line.strip())
-            current_line = word + " "
-    lines.append(current_line.strip())
-    wrapped_text = "\n".join(lines[:3]) # Max 3 lines
+    for index, frame_progress, audio_level in zip(segment_index.tolist(), progress.tolist(),
+                                                  amplitude_frames):
+        builder, kwargs = segments[index][:2]
+        yield frame_spec(
+            particle_system, builder, width=width, height=height,
+            progress=frame_progress, audio_level=audio_level, **kwargs
+        )
+
+def write_frames(writer, frame_specs, particle_system, workers=RENDER_WORKERS):
+    """
+    Render frame_specs and stream them into the ffmpeg writer, in order
+    With workers > 1 frames are rendered by a process pool; at most a few
+    frames per worker are held in memory while waiting to be written
+    Returns the number of frames written
+    """
+    frame_count = 0
+    
+    if workers <= 1:
+        # Separate copy: frame_specs may still be advancing particle_system
+        _init_render_worker(copy.deepcopy(particle_system))
+        for spec in frame_specs:
+            writer.stdin.write(_render_frame(spec).data)
+            frame_count += 1
+        return frame_count
     
-    text_img = va.create_animated_text(width, height, wrapped_text, font_size, progress, 'slide', audio_level)
-    base_img.paste(text_img, (0, 0), text_img)
+    # Workers are spawned, not forked: Numba's threading layer isn't fork-safe
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, _init_render_worker, (particle_system,)) as pool:
+        pending = deque()
+        for spec in frame_specs:
+            pending.append(pool.apply_async(_render_frame, (spec,)))
+            if len(pending) >= workers * 4:
+                writer.stdin.write(pending.popleft().get().data)
+                frame_count += 1
+        while pending:
+            writer.stdin.write(pending.popleft().get().data)
+            frame_count += 1
     
-    return np.array(base_img)
+    return frame_count
+
+def frame_rms(y, sr, fps, num_frames):
+    """
+    Root-mean-square energy of audio y (sampled at sr) in each of num_frames video frames
+    Frame i covers samples round(i * sr / fps) up to round((i + 1) * sr / fps), so the
+    windows stay in step with the video even when fps doesn't divide sr
+    Frames past the end of the audio repeat the last frame's value
+    """
+    bounds = np.minimum(np.round(np.arange(num_frames + 1) * sr / fps).astype(np.int64), len(y))
+    energy = np.concatenate(([0.0], np.cumsum(np.square(y, dtype=np.float64))))
+    counts = np.diff(bounds)
+    rms = np.sqrt((energy[bounds[1:]] - energy[bounds[:-1]]) / np.maximum(counts, 1))
+    # Fill empty windows from the last non-empty one
+    filled = np.maximum.accumulate(np.where(counts > 0, np.arange(num_frames), 0))
+    return rms[filled]
+
+def load_news_items(news_file='data/today_news.json'):
+    """
+    Load the news articles to show, or a single placeholder item if there are none
+    """
+    news_items = []
+    try:
+        news_data = load_json(news_file)
+        news_items = news_data.get('articles', [])
+    except Exception as e:
+        logger.warning(f"Warning: Could not load news data. Using default. Error: {e}")
+    
+    if not news_items:
+        news_items = [{'title': 'Thanks for tuning in! No news items found.'}]
+    return news_items
 
 
 def create_video_from_audio(
     audio_file='data/ai_news_audio.mp3',
     output_file='output/ai_tech_bytes.mp4',
-    platform='youtube_shorts'
+    platform='youtube_shorts',
+    quality='draft',
+    scaled_platforms=None,
+    codec='libx264'
 ):
     """
     Create a video with audio and animated news frames that change per article
+    quality: 'draft' (fast encode) or 'production' (see VIDEO_QUALITY)
+    scaled_platforms: optional {platform: output_file} of extra formats encoded
+        from the same frames, resized by ffmpeg (use same-aspect-ratio platforms)
+    codec: one of VIDEO_CODECS; 'h264_nvenc' moves encoding to an NVIDIA GPU
     """
+    writer = None
     try:
-        # Load audio and get settings
-        print("Loading audio file...")
-        audio = AudioFileClip(audio_file)
-        duration = audio.duration
-        print(f"Audio duration: {duration:.2f} seconds")
+        # Load audio and get settings; the news JSON is read on a thread meanwhile
+        logger.info("Loading audio file...")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            news_future = executor.submit(load_news_items)
+            # Only the loudness envelope is used, so the fast low-quality resampler is enough
+            y, sr = librosa.load(audio_file, sr=8000, mono=True, res_type='soxr_lq')
+            news_items = news_future.result()
+        duration = len(y) / sr
+        logger.info(f"Audio duration: {duration:.2f} seconds")
         
         settings = VIDEO_SETTINGS.get(platform, VIDEO_SETTINGS['youtube_shorts'])
         width, height, fps = settings['width'], settings['height'], settings['fps']
 
         # --- AUDIO ANALYSIS (NEW) ---
-        print("Analyzing audio with Librosa...")
-        y, sr = librosa.load(audio_file, sr=8000)
-        # Get Root-Mean-Square (RMS) energy, a good proxy for volume
-        rms = librosa.feature.rms(y=y)[0]
-        # Normalize RMS to be between 0.0 and 1.0
-        rms_normalized = (rms - np.min(rms)) / (np.max(rms) - np.min(rms) + 1e-6)
-        
-        # Interpolate audio data to match the number of video frames
+        logger.info("Analyzing audio...")
+        # Get Root-Mean-Square (RMS) energy, a good proxy for volume, with one RMS
+        # window per video frame so no interpolation is needed
         total_video_frames = math.ceil(duration * fps)
-        # Create an array of frame indices [0, 1, 2, ..., total_video_frames-1]
-        video_frame_indices = np.arange(total_video_frames)
-        # Create an array of audio sample indices
-        audio_sample_indices = np.linspace(0, len(rms_normalized) - 1, total_video_frames)
-        # Interpolate: Map audio data to video frames
-        amplitude_frames = np.interp(video_frame_indices, np.arange(len(rms_normalized)), rms_normalized)
-        print(f"Analyzed audio and mapped to {len(amplitude_frames)} video frames.")
+        rms = frame_rms(y, sr, fps, total_video_frames)
+        # Normalize RMS to be between 0.0 and 1.0
+        amplitude_frames = (rms - rms.min()) * (1.0 / (np.ptp(rms) + 1e-6))
+        logger.info(f"Analyzed audio and mapped to {len(amplitude_frames)} video frames.")
         # --- END OF AUDIO ANALYSIS ---
 
-        # Load news items
-        news_items = []
-        try:
-            with open('data/today_news.json', 'r', encoding='utf-8') as f:
-                news_data = json.load(f)
-                news_items = news_data.get('articles', [])
-        except Exception as e:
-            print(f"Warning: Could not load news data. Using default. Error: {e}")
-        
-        if not news_items:
-            news_items = [{'title': 'Thanks for tuning in! No news items found.'}]
-
         # Durations
         intro_duration = 3.0
         outro_duration = 3.0
         content_duration = duration - intro_duration - outro_duration
         
         if content_duration < 0:
-            print("Warning: Audio is very short. Adjusting scene durations.")
+            logger.warning("Warning: Audio is very short. Adjusting scene durations.")
             intro_duration = min(1.0, duration * 0.4)
             outro_duration = min(1.0, duration * 0.4)
             content_duration = duration - intro_duration - outro_duration
@@ -173,126 +415,88 @@ def create_video_from_audio(
         num_articles = len(news_items)
         duration_per_article = content_duration / num_articles if num_articles > 0 else 0
 
+        # Create output directory
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        scaled_outputs = []
+        for scaled_platform, scaled_file in (scaled_platforms or {}).items():
+            scaled_settings = VIDEO_SETTINGS[scaled_platform]
+            os.makedirs(os.path.dirname(scaled_file), exist_ok=True)
+            scaled_outputs.append((scaled_file, scaled_settings['width'], scaled_settings['height']))
+
         # --- FRAME GENERATION LOOP (REFACTORED) ---
-        print("Creating animated visual frames...")
-        all_clips = []
-        frame_counter = 0 # Global frame counter
+        # Frames are described on demand, rendered (in parallel, see RENDER_WORKERS)
+        # and streamed straight into ffmpeg in order
+        logger.info(f"Creating animated visual frames and writing video to {output_file}...")
         
         # Initialize Particle System
         particle_sys = va.ParticleSystem(width, height, num_particles=100)
+        frame_specs = generate_frame_specs(width, height, fps, particle_sys, amplitude_frames,
+                                           news_items, intro_duration, duration_per_article)
         
-        # 1. Create Intro Frames
-        intro_frames = int(intro_duration * fps)
-        for i in range(intro_frames):
-            if frame_counter >= total_video_frames: break
-            progress = i / (intro_frames - 1) if intro_frames > 1 else 0
-            audio_level = amplitude_frames[frame_counter]
-            
-            frame = create_animated_scene(
-                width, height, particle_sys, 
-                "AI TECH BYTES\nDaily News Update", 
-                text_effect='zoom', shape='lines',
-                progress=progress, audio_level=audio_level
-            )
-            all_clips.append(ImageClip(frame).set_duration(1.0 / fps))
-            frame_counter += 1
-
-        # 2. Create News Article Frames
-        for idx, news_item in enumerate(news_items):
-            title = news_item.get('title', 'AI News')
-            num_frames_for_article = int(duration_per_article * fps)
-            
-            for i in range(num_frames_for_article):
-                if frame_counter >= total_video_frames: break
-                progress = i / (num_frames_for_article - 1) if num_frames_for_article > 1 else 0
-                audio_level = amplitude_frames[frame_counter]
-                
-                frame = create_animated_news_frame_enhanced(
-                    width, height, particle_sys,
-                    f"Story {idx + 1}: {title}",
-                    progress=progress,
-                    audio_level=audio_level
-                )
-                all_clips.append(ImageClip(frame).set_duration(1.0 / fps))
-                frame_counter += 1
-
-        # 3. Create Outro Frames
-        # Fill remaining time with outro
-        outro_frames = total_video_frames - frame_counter
-        for i in range(outro_frames):
-            if frame_counter >= total_video_frames: break
-            progress = i / (outro_frames - 1) if outro_frames > 1 else 0
-            audio_level = amplitude_frames[frame_counter]
-            
-            frame = create_animated_scene(
-                width, height, particle_sys,
-                "Thanks for watching!\nSubscribe for more.",
-                text_effect='fade', shape='circles',
-                progress=progress, audio_level=audio_level
-            )
-            all_clips.append(ImageClip(frame).set_duration(1.0 / fps))
-            frame_counter += 1
-
-        print(f"Generated {len(all_clips)} total frames.")
+        codec = resolve_codec(codec)
+        logger.info(f"Encoding with {codec} ({quality})")
+        writer = start_ffmpeg_writer(output_file, width, height, fps, audio_file, quality, scaled_outputs, codec)
+        frame_counter = write_frames(writer, frame_specs, particle_sys)
+        finish_ffmpeg_writer(writer)
+        logger.info(f"Generated {frame_counter} total frames.")
         # --- END OF FRAME GENERATION ---
 
-        # Composite all clips
-        video = concatenate_videoclips(all_clips)
-        
-        # Ensure video duration exactly matches audio
-        video = video.set_duration(duration)
-        video = video.set_audio(audio)
-
-        # Create output directory
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-
-        # Write video file
-        print(f"Writing video to {output_file}...")
-        video.write_videofile(
-            output_file,
-            fps=fps,
-            codec='libx264',
-            audio_codec='aac',
-            temp_audiofile='temp-audio.m4a',
-            remove_temp=True,
-            threads=4,
-            preset='ultrafast'
-        )
-
-        print(f"\n[OK] Video created successfully: {output_file}")
+        logger.info(f"\n[OK] Video created successfully: {output_file}")
         return output_file
 
     except Exception as e:
-        print(f"[ERROR] Error creating video: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"[ERROR] Error creating video: {e}")
         return None
 
-def create_multiple_formats(audio_file='data/ai_news_audio.mp3'):
+    finally:
+        # Don't leave ffmpeg running if frame generation failed part-way
+        if writer is not None and writer.poll() is None:
+            writer.kill()
+
+def create_multiple_formats(audio_file='data/ai_news_audio.mp3', quality='draft', codec='libx264'):
     """
     Create videos in multiple formats for different platforms
+    quality: 'draft' (fast encode) or 'production' (see VIDEO_QUALITY)
+    codec: one of VIDEO_CODECS
     """
     platforms = ['youtube_shorts']
     created_videos = []
     
+    # Platforms with the same aspect ratio and fps share one render: frames are
+    # drawn at the largest size and ffmpeg scales them down for the others
+    groups = {}
     for platform in platforms:
+        settings = VIDEO_SETTINGS[platform]
+        divisor = math.gcd(settings['width'], settings['height'])
+        key = (settings['width'] // divisor, settings['height'] // divisor, settings['fps'])
+        groups.setdefault(key, []).append(platform)
+    
+    for group in groups.values():
+        group.sort(key=lambda name: VIDEO_SETTINGS[name]['width'], reverse=True)
+        platform = group[0]
         output_file = f'output/ai_tech_bytes_{platform}.mp4'
-        print(f"\n{'='*60}")
-        print(f"Creating video for {platform}...")
-        print(f"{'='*60}")
+        scaled_platforms = {name: f'output/ai_tech_bytes_{name}.mp4' for name in group[1:]}
+        logger.info(f"\n{'='*60}")
+        logger.info(f"Creating video for {', '.join(group)}...")
+        logger.info(f"{'='*60}")
         
         result = create_video_from_audio(
             audio_file=audio_file,
             output_file=output_file,
-            platform=platform
+            platform=platform,
+            quality=quality,
+            scaled_platforms=scaled_platforms,
+            codec=codec
         )
         
         if result:
             created_videos.append(result)
+            created_videos.extend(scaled_platforms.values())
     
     return created_videos
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("=== AI Tech Bytes - Video Maker ===")
     
     # Ensure data/output dirs exist